@@ -1,19 +1,43 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
 from datetime import datetime, timedelta, timezone
 import pytz
 import re
 import time
 import html
+import itertools
 import json
+import multiprocessing
+import argparse
+import atexit
+import bisect
+import collections
+import csv
+import gzip
 import hashlib
+import os
+import queue
+import random
+import sqlite3
+import tempfile
+import threading
+import unicodedata
+import zipfile
+import zlib
+from dataclasses import dataclass, field, replace
+from difflib import SequenceMatcher
+from functools import lru_cache, partial
+from email.utils import parsedate_to_datetime
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from urllib.parse import urljoin, urlparse, urlunparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urljoin, urlparse, urlunparse
 from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
 
 # =========================
@@ -26,10 +50,51 @@ HEADERS = {
     "User-Agent": "Mozilla/5.0 (compatible; EventsBot/1.0)"
 }
 
+HTTP_POOL_SIZE = 8
+PAGE_FETCH_WORKERS = 4
+
+# Slušné sťahovanie: token bucket na host, exponenciálny backoff s jitterom, istič.
+HOST_RATE = float(os.environ.get("CIKE_HOST_RATE", "2"))   # požiadaviek za sekundu na host
+HOST_BURST = 4
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+RETRY_AFTER_MAX = 120.0
+RETRYABLE_4XX = {408, 425, 429}
+BREAKER_THRESHOLD = 3      # po toľkých neúspešných požiadavkách za sebou sa host odstaví
+BREAKER_COOLDOWN = 300
+
+STATE_DIR = os.environ.get("CIKE_STATE_DIR", ".cache")
+
+METRICS_ENABLED = os.environ.get("CIKE_METRICS", "1") != "0"
+
+HTTP_CACHE_ENABLED = os.environ.get("CIKE_HTTP_CACHE", "1") != "0"
+HTTP_CACHE_DIR = os.path.join(STATE_DIR, "http")
+HTTP_CACHE_MAX_BYTES = 64 * 1024 * 1024
+HTTP_CACHE_DEFAULT_TTL = 3600
+HTTP_CACHE_TTL_RULES = [
+    # minulé podujatia sa takmer nemenia
+    (re.compile(r"eventDisplay=past|e-page-9843d5f="), 7 * 24 * 3600),
+]
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# Stromy len pre časti stránky, ktoré extraktory reálne používajú.
+ITV_STRAINER = SoupStrainer("div", class_=re.compile(r"(?:^|\s)e-loop-item(?:\s|$)"))
+JSONLD_STRAINER = SoupStrainer("script", attrs={"type": "application/ld+json"})
+
 # =========================
 # Pomocné funkcie
 # =========================
 
+
+def make_soup(markup, only=None):
+    return BeautifulSoup(markup, HTML_PARSER, parse_only=only)
+
+
 _SK_MONTHS = {
     "január": 1, "januára": 1, "jan": 1,
     "február": 2, "februára": 2, "feb": 2,
@@ -74,21 +139,510 @@ def normalize_source(src: str) -> str:
     return "OTHER"
 
 
-def http_get(url: str, timeout: int = 25, retries: int = 3, verify: bool = True):
+_SESSIONS = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+def get_session(url: str) -> requests.Session:
+    host = urlparse(url).netloc.lower()
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(host)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(HEADERS)
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _SESSIONS[host] = session
+    return session
+
+
+class HostLimiter:
+    def __init__(self, host, rate=HOST_RATE, burst=HOST_BURST):
+        self.host = host
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.failures = 0
+        self.open_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                wait = self.blocked_until - now
+                if wait <= 0:
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def defer(self, seconds):
+        # Retry-After / preťaženie: pribrzdí všetky vlákna, ktoré idú na tento host
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def is_open(self):
+        return time.monotonic() < self.open_until
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.failures >= BREAKER_THRESHOLD and not self.is_open():
+                self.open_until = time.monotonic() + BREAKER_COOLDOWN
+                print(f"⛔ {self.host}: {self.failures} zlyhaní za sebou, ďalšie požiadavky sa {BREAKER_COOLDOWN}s preskočia")
+
+
+_LIMITERS = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def get_host_limiter(url: str) -> HostLimiter:
+    host = urlparse(url).netloc.lower()
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(host)
+        if limiter is None:
+            limiter = _LIMITERS[host] = HostLimiter(host)
+    return limiter
+
+
+def _backoff_delay(attempt: int) -> float:
+    cap = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt))
+    return cap / 2 + random.uniform(0, cap / 2)
+
+
+def _retry_after(resp):
+    value = (resp.headers.get("Retry-After") or "").strip()
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), RETRY_AFTER_MAX)
+
+
+class CachedResponse:
+    def __init__(self, url, content, encoding, headers, status_code=200):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.encoding = encoding or "utf-8"
+        self.headers = headers
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors="replace")
+
+
+class HttpCache:
+    def __init__(self, root, max_bytes=HTTP_CACHE_MAX_BYTES,
+                 ttl_rules=HTTP_CACHE_TTL_RULES, default_ttl=HTTP_CACHE_DEFAULT_TTL):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.ttl_rules = ttl_rules
+        self.default_ttl = default_ttl
+        self.lock = threading.Lock()
+        self.stats = {"hit": 0, "revalidated": 0, "miss": 0, "bytes_saved": 0, "seconds_saved": 0.0}
+
+    def _paths(self, url):
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.root, key + ".body"), os.path.join(self.root, key + ".json")
+
+    def ttl_for(self, url):
+        for pattern, ttl in self.ttl_rules:
+            if pattern.search(url):
+                return ttl
+        return self.default_ttl
+
+    def lookup(self, url):
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        return meta, body
+
+    def is_fresh(self, url, entry):
+        meta, _ = entry
+        return time.time() - meta.get("fetched_at", 0) < self.ttl_for(url)
+
+    def validators(self, entry):
+        meta, _ = entry
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def _write_meta(self, meta_path, meta):
+        tmp = meta_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp, meta_path)
+
+    def serve(self, url, entry, kind):
+        meta, body = entry
+        now = time.time()
+        meta["last_access"] = now
+        if kind == "revalidated":
+            meta["fetched_at"] = now
+        try:
+            self._write_meta(self._paths(url)[1], meta)
+        except OSError:
+            pass
+        with self.lock:
+            self.stats[kind] += 1
+            self.stats["bytes_saved"] += len(body)
+            if kind == "hit":
+                self.stats["seconds_saved"] += meta.get("elapsed", 0.0)
+        return CachedResponse(url, body, meta.get("encoding"), meta.get("headers", {}))
+
+    def store(self, url, r):
+        with self.lock:
+            self.stats["miss"] += 1
+        body_path, meta_path = self._paths(url)
+        now = time.time()
+        meta = {
+            "url": url,
+            "etag": r.headers.get("ETag"),
+            "last_modified": r.headers.get("Last-Modified"),
+            "encoding": r.encoding or r.apparent_encoding,
+            "headers": {k: v for k, v in r.headers.items() if k.lower() == "content-type"},
+            "elapsed": r.elapsed.total_seconds() if r.elapsed else 0.0,
+            "size": len(r.content),
+            "fetched_at": now,
+            "last_access": now,
+        }
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            with open(body_path + ".tmp", "wb") as f:
+                f.write(r.content)
+            os.replace(body_path + ".tmp", body_path)
+            self._write_meta(meta_path, meta)
+        except OSError as e:
+            print(f"⚠️ HTTP cache: zápis zlyhal pre {url}: {e}")
+
+    def evict(self):
+        try:
+            names = [n for n in os.listdir(self.root) if n.endswith(".json")]
+        except OSError:
+            return 0
+        entries = []
+        for name in names:
+            meta_path = os.path.join(self.root, name)
+            try:
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                meta = {}
+            entries.append((meta.get("last_access", 0), meta.get("size", 0), meta_path))
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, meta_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            for path in (meta_path, meta_path[:-len(".json")] + ".body"):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+            removed += 1
+        return removed
+
+    def report(self):
+        removed = self.evict()
+        st = self.stats
+        print(
+            f"📦 HTTP cache: hit {st['hit']}, revalidované {st['revalidated']}, miss {st['miss']}"
+            f" – ušetrené {st['bytes_saved'] / 1024:.0f} kB, ~{st['seconds_saved']:.1f}s"
+            + (f", vyhodené {removed}" if removed else "")
+        )
+
+
+HTTP_CACHE = HttpCache(HTTP_CACHE_DIR) if HTTP_CACHE_ENABLED else None
+
+
+class RunMetrics:
+    PAGE_FIELDS = [
+        "source", "url", "status", "cache", "fetch_ms", "bytes", "retries",
+        "parse_ms", "candidates", "events", "duplicate", "stale",
+    ]
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = datetime.now()
+        self.fetches = {}
+        self.pages = {}
+        self.sources = {}
+        self.export = {}
+
+    def fetch(self, url, **fields):
+        with self.lock:
+            self.fetches.setdefault(url, {}).update(fields)
+
+    def page(self, source, url, **fields):
+        with self.lock:
+            self.pages.setdefault((source, url), {}).update(fields)
+
+    def source(self, name, **fields):
+        with self.lock:
+            self.sources.setdefault(name, {}).update(fields)
+
+    def export_step(self, **fields):
+        with self.lock:
+            self.export.update(fields)
+
+    def page_rows(self):
+        rows = []
+        for (source, url), page in self.pages.items():
+            row = {"source": source, "url": url}
+            row.update(self.fetches.get(url, {}))
+            row.update(page)
+            rows.append(row)
+        return rows
+
+    def write(self, ics_filename):
+        base = os.path.splitext(ics_filename)[0]
+        report = {
+            "started": self.started.isoformat(timespec="seconds"),
+            "finished": datetime.now().isoformat(timespec="seconds"),
+            "sources": self.sources,
+            "pages": self.page_rows(),
+            "export": self.export,
+            "http_cache": HTTP_CACHE.stats if HTTP_CACHE else None,
+        }
+        try:
+            with open(base + ".metrics.json", "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+                f.write("\n")
+            with open(base + ".metrics.csv", "w", encoding="utf-8", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=self.PAGE_FIELDS, extrasaction="ignore")
+                writer.writeheader()
+                writer.writerows(report["pages"])
+        except OSError as e:
+            print(f"⚠️ Metriky sa nepodarilo zapísať: {e}")
+            return None
+        print(f"📊 Metriky: {base}.metrics.json, {base}.metrics.csv")
+        return base + ".metrics.json"
+
+
+METRICS = RunMetrics() if METRICS_ENABLED else None
+
+
+# =========================
+# Transport: živá sieť, nahrávanie a prehrávanie
+# =========================
+# Nahrávka je zip: index.json (url -> stav, hlavičky, kódovanie, súbor) a telá odpovedí,
+# plus snímky driver.page_source z AmCham prehliadača.
+
+
+class LiveTransport:
+    throttled = True
+
+    def get(self, url, timeout, verify, headers):
+        return get_session(url).get(url, timeout=timeout, verify=verify, headers=headers)
+
+    def page_source(self, key, driver):
+        return driver.page_source
+
+    def close(self):
+        pass
+
+
+class RecordingTransport(LiveTransport):
+    def __init__(self, path):
+        self.path = path
+        self.archive = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=6)
+        self.index = {"responses": {}, "snapshots": {}}
+        self.lock = threading.Lock()
+
+    def _write(self, section, key, payload, meta):
+        with self.lock:
+            name = f"{section}/{len(self.index[section]):05d}"
+            self.archive.writestr(name, payload)
+            self.index[section][key] = dict(meta, file=name)
+
+    def get(self, url, timeout, verify, headers):
+        r = super().get(url, timeout, verify, headers)
+        self._write("responses", url, r.content, {
+            "status": r.status_code,
+            "encoding": r.encoding or r.apparent_encoding,
+            "headers": {k: v for k, v in r.headers.items() if k.lower() in ("content-type", "retry-after")},
+        })
+        return r
+
+    def page_source(self, key, driver):
+        source = driver.page_source
+        self._write("snapshots", key, source.encode("utf-8"), {})
+        return source
+
+    def close(self):
+        with self.lock:
+            if self.archive.fp is None:
+                return
+            self.archive.writestr("index.json", json.dumps(self.index, ensure_ascii=False, indent=1))
+            self.archive.close()
+        print(f"📼 Nahrávka: {len(self.index['responses'])} odpovedí, "
+              f"{len(self.index['snapshots'])} snímok -> {self.path}")
+
+
+class ReplayTransport:
+    throttled = False
+
+    def __init__(self, path):
+        self.path = path
+        self.archive = zipfile.ZipFile(path, "r")
+        self.index = json.loads(self.archive.read("index.json"))
+        self.lock = threading.Lock()
+        self.missing = []
+
+    def _read(self, name):
+        with self.lock:
+            return self.archive.read(name)
+
+    def get(self, url, timeout, verify, headers):
+        meta = self.index["responses"].get(url)
+        if meta is None:
+            # 404 namiesto výnimky: bez opakovaní, backoffu a ističa
+            self.missing.append(url)
+            return CachedResponse(url, b"", "utf-8", {}, status_code=404)
+        return CachedResponse(url, self._read(meta["file"]), meta.get("encoding"),
+                              meta.get("headers", {}), status_code=meta["status"])
+
+    def snapshot(self, key):
+        meta = self.index["snapshots"].get(key)
+        return self._read(meta["file"]).decode("utf-8") if meta else ""
+
+    def page_source(self, key, driver):
+        return self.snapshot(key)
+
+    def close(self):
+        if self.missing:
+            print(f"⚠️ Prehrávanie: {len(self.missing)} URL chýba v nahrávke (napr. {self.missing[0]})")
+        self.archive.close()
+
+
+TRANSPORT = LiveTransport()
+
+
+def _metric_fetch(url, **fields):
+    if METRICS:
+        METRICS.fetch(url, **fields)
+
+
+def _metric_page(source, url, **fields):
+    if METRICS:
+        METRICS.page(source, url, **fields)
+
+
+def _elapsed_ms(t0):
+    return round((time.perf_counter() - t0) * 1000, 1)
+
+
+def http_get(url: str, timeout: int = 25, retries: int = 3, verify: bool = True, headers=None, force: bool = False):
+    # force (--force): ani čerstvý záznam z cache sa nepoužije bez revalidácie na serveri.
+    t0 = time.perf_counter()
+    cache = HTTP_CACHE
+    entry = cache.lookup(url) if cache else None
+    if entry and not force and cache.is_fresh(url, entry):
+        resp = cache.serve(url, entry, "hit")
+        _metric_fetch(url, status=200, cache="hit", fetch_ms=_elapsed_ms(t0), bytes=len(resp.content), retries=0)
+        return resp
+    cond_headers = dict(headers or {})
+    if entry:
+        cond_headers.update(cache.validators(entry))
+
+    transport = TRANSPORT
+    limiter = get_host_limiter(url)
+    if limiter.is_open():
+        print(f"⛔ GET preskočený (istič) {url}")
+        _metric_fetch(url, status=None, cache="breaker", fetch_ms=_elapsed_ms(t0), bytes=0, retries=0)
+        return None
+
     last_err = None
-    for _ in range(retries):
+    status = None
+    host_failure = False
+    for attempt in range(retries):
+        delay = None
+        if transport.throttled:
+            limiter.acquire()
         try:
-            r = requests.get(url, headers=HEADERS, timeout=timeout, verify=verify)
+            r = transport.get(url, timeout, verify, cond_headers)
+            status = r.status_code
+            if r.status_code == 304 and entry:
+                limiter.record_success()
+                resp = cache.serve(url, entry, "revalidated")
+                _metric_fetch(url, status=304, cache="revalidated", fetch_ms=_elapsed_ms(t0),
+                              bytes=len(r.content), retries=attempt)
+                return resp
             if r.status_code == 200:
+                limiter.record_success()
+                if cache:
+                    cache.store(url, r)
+                _metric_fetch(url, status=200, cache="miss" if cache else "", fetch_ms=_elapsed_ms(t0),
+                              bytes=len(r.content), retries=attempt)
                 return r
             last_err = f"HTTP {r.status_code}"
+            if 400 <= r.status_code < 500 and r.status_code not in RETRYABLE_4XX:
+                # 404/403/...: opakovanie nepomôže a host je v poriadku
+                limiter.record_success()
+                host_failure = False
+                break
+            host_failure = r.status_code >= 500 or r.status_code in RETRYABLE_4XX
+            delay = _retry_after(r)
+            if delay is not None:
+                limiter.defer(delay)
         except Exception as e:
             last_err = str(e)
-        time.sleep(1.0)
+            host_failure = True
+        if attempt < retries - 1:
+            time.sleep(delay if delay is not None else _backoff_delay(attempt))
+    if host_failure:
+        limiter.record_failure()
     print(f"⚠️ GET fail {url}: {last_err}")
+    _metric_fetch(url, status=status, cache="fail", fetch_ms=_elapsed_ms(t0), bytes=0, retries=attempt)
     return None
 
 
+def iter_pages(urls, fetch, max_workers: int = PAGE_FETCH_WORKERS):
+    # Stiahne stránky paralelne (najviac max_workers naraz), ale vracia ich v poradí.
+    # Keď volajúci preruší cyklus (napr. na prvej prázdnej stránke), zvyšné sa zrušia.
+    urls = list(urls)
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="page")
+    pending = {}
+    submitted = 0
+    try:
+        for idx, url in enumerate(urls):
+            while submitted < len(urls) and submitted < idx + max_workers:
+                pending[submitted] = pool.submit(fetch, urls[submitted])
+                submitted += 1
+            yield url, pending.pop(idx).result()
+    finally:
+        for fut in pending.values():
+            fut.cancel()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
 def normalize_event_url(url: str) -> str:
     if not url:
         return ""
@@ -102,57 +656,58 @@ def normalize_event_url(url: str) -> str:
         return url.strip()
 
 
-def parse_numeric_or_sk_date(text: str):
-    if not text:
-        return None, None
+# Jeden vzor pre všetky štyri formáty: každá voliteľná lookahead vetva zachytí
+# prvý výskyt svojho formátu, priorita formátov sa vyhodnotí až v kóde.
+_SK_DATE_RE = re.compile(
+    r"^"
+    r"(?=.*?\b(?P<r_d1>\d{1,2})\.\s*(?P<r_m1>\d{1,2})\.\s*(?P<r_y1>\d{4})\b\s*[–-]\s*"
+    r"\b(?P<r_d2>\d{1,2})\.\s*(?P<r_m2>\d{1,2})\.\s*(?P<r_y2>\d{4})\b)?"
+    r"(?=.*?\b(?P<w_d1>\d{1,2})\.\s*[–-]\s*(?P<w_d2>\d{1,2})\.\s*(?P<w_mon>[a-zá-ž]+)\s+(?P<w_y>\d{4})\b)?"
+    r"(?=.*?\b(?P<n_d>\d{1,2})\.\s*(?P<n_m>\d{1,2})\.\s*(?P<n_y>\d{4})\b)?"
+    r"(?=.*?\b(?P<s_d>\d{1,2})\s+(?P<s_mon>[a-zá-ž]+)\s+(?P<s_y>\d{4})\b)?"
+)
 
-    t = html.unescape(text)
-    t = " ".join(t.lower().split())
-    t = t.replace("—", "–")
+SK_DATE_CACHE_SIZE = 4096
 
-    m = re.search(
-        r"\b(\d{1,2})\.\s*(\d{1,2})\.\s*(\d{4})\b\s*[–-]\s*\b(\d{1,2})\.\s*(\d{1,2})\.\s*(\d{4})\b",
-        t
-    )
-    if m:
-        s = datetime(int(m.group(3)), int(m.group(2)), int(m.group(1)))
-        e = datetime(int(m.group(6)), int(m.group(5)), int(m.group(4)))
+
+def _normalize_date_text(text: str) -> str:
+    return " ".join(html.unescape(text).lower().split()).replace("—", "–")
+
+
+@lru_cache(maxsize=SK_DATE_CACHE_SIZE)
+def _parse_normalized_sk_date(t: str):
+    g = _SK_DATE_RE.match(t).groupdict()
+
+    if g["r_d1"]:
+        s = datetime(int(g["r_y1"]), int(g["r_m1"]), int(g["r_d1"]))
+        e = datetime(int(g["r_y2"]), int(g["r_m2"]), int(g["r_d2"]))
         return s, e
 
-    m = re.search(
-        r"\b(\d{1,2})\.\s*[–-]\s*(\d{1,2})\.\s*([a-zá-ž]+)\s+(\d{4})\b",
-        t
-    )
-    if m:
-        d1 = int(m.group(1))
-        d2 = int(m.group(2))
-        mon_word = m.group(3).strip(".")
-        y = int(m.group(4))
-        mo = _SK_MONTHS.get(mon_word)
+    if g["w_d1"]:
+        mo = _SK_MONTHS.get(g["w_mon"].strip("."))
         if mo:
-            s = datetime(y, mo, d1)
-            e = datetime(y, mo, d2)
-            return s, e
-
-    m = re.search(r"\b(\d{1,2})\.\s*(\d{1,2})\.\s*(\d{4})\b", t)
-    if m:
-        d, mo, y = int(m.group(1)), int(m.group(2)), int(m.group(3))
-        dt = datetime(y, mo, d)
+            y = int(g["w_y"])
+            return datetime(y, mo, int(g["w_d1"])), datetime(y, mo, int(g["w_d2"]))
+
+    if g["n_d"]:
+        dt = datetime(int(g["n_y"]), int(g["n_m"]), int(g["n_d"]))
         return dt, dt
 
-    m = re.search(r"\b(\d{1,2})\s+([a-zá-ž]+)\s+(\d{4})\b", t)
-    if m:
-        d = int(m.group(1))
-        mon_word = m.group(2).strip(".")
-        y = int(m.group(3))
-        mo = _SK_MONTHS.get(mon_word)
+    if g["s_d"]:
+        mo = _SK_MONTHS.get(g["s_mon"].strip("."))
         if mo:
-            dt = datetime(y, mo, d)
+            dt = datetime(int(g["s_y"]), mo, int(g["s_d"]))
             return dt, dt
 
     return None, None
 
 
+def parse_numeric_or_sk_date(text: str):
+    if not text:
+        return None, None
+    return _parse_normalized_sk_date(_normalize_date_text(text))
+
+
 def parse_time_range(text: str):
     m = re.search(r"@\s*(\d{1,2}):(\d{2})\s*[-–]\s*(\d{1,2}):(\d{2})", text or "")
     if not m:
@@ -175,21 +730,21 @@ def ics_escape(text: str) -> str:
 
 
 def fold_ical_line(line: str, limit: int = 75) -> str:
-    if len(line.encode("utf-8")) <= limit:
+    data = line.encode("utf-8")
+    if len(data) <= limit:
         return line
 
+    # Jeden prechod po bajtoch; rez sa posúva späť, ak by padol do stredu UTF-8 znaku.
     out = []
-    current = ""
-    for ch in line:
-        candidate = current + ch
-        if len(candidate.encode("utf-8")) > limit:
-            out.append(current)
-            current = " " + ch
-        else:
-            current = candidate
-    if current:
-        out.append(current)
-    return "\r\n".join(out)
+    start, size, budget = 0, len(data), limit
+    while size - start > budget:
+        end = start + budget
+        while data[end] & 0xC0 == 0x80:
+            end -= 1
+        out.append(data[start:end])
+        start, budget = end, limit - 1
+    out.append(data[start:])
+    return b"\r\n ".join(out).decode("utf-8")
 
 
 def format_utc_dt(dt: datetime) -> str:
@@ -203,6 +758,322 @@ def format_date_only(d) -> str:
     return d.strftime("%Y%m%d")
 
 
+# =========================
+# Model udalosti
+# =========================
+
+@dataclass(frozen=True, slots=True)
+class Event:
+    summary: str
+    start: datetime
+    end: datetime
+    source: str = "OTHER"
+    location: str = ""
+    description: str = ""
+    url: str = ""
+
+    # Odvodené hodnoty sa počítajú raz pri vzniku udalosti.
+    src: str = field(init=False, repr=False, compare=False)
+    norm_url: str = field(init=False, repr=False, compare=False)
+    clean_title: str = field(init=False, repr=False, compare=False)
+    all_day: bool = field(init=False, repr=False, compare=False)
+    dedupe_key: tuple = field(init=False, repr=False, compare=False)
+    uid: str = field(init=False, repr=False, compare=False)
+    dtstamp: datetime = field(init=False, repr=False, compare=False)
+    content_hash: str = field(init=False, repr=False, compare=False)
+
+    FIELDS = ("summary", "location", "description", "start", "end", "source", "url")
+
+    def __post_init__(self):
+        set_ = object.__setattr__
+        s, e = self.start, self.end
+        norm_url = normalize_event_url(self.url or "")
+        title = _clean_event_title(self.summary)
+        all_day = _is_all_day_00(self) or _looks_fake_all_day(self)
+
+        if norm_url:
+            dedupe_key = ("url", norm_url)
+            uid_base = f"url|{norm_url}"
+            stamp_base = f"dtstamp|{norm_url}"
+        else:
+            start_part = s.strftime("%Y-%m-%d %H:%M")
+            end_part = e.strftime("%Y-%m-%d %H:%M")
+            if all_day:
+                dedupe_key = (title, s.strftime("%Y-%m-%d"), e.strftime("%Y-%m-%d"))
+            else:
+                dedupe_key = (title, start_part, end_part)
+            uid_base = f"{title}|{start_part}|{end_part}|{'ALLDAY' if all_day else 'TIMED'}"
+            stamp_base = f"dtstamp|{uid_base}"
+
+        src = normalize_source(self.source)
+        stamp_seed = int(hashlib.sha1(stamp_base.encode("utf-8")).hexdigest()[:8], 16)
+        content = "\x1f".join([
+            src, self.summary or "", self.location or "", self.description or "",
+            self.url or "", s.isoformat(), e.isoformat(),
+        ])
+
+        set_(self, "src", src)
+        set_(self, "norm_url", norm_url)
+        set_(self, "clean_title", title)
+        set_(self, "all_day", all_day)
+        set_(self, "dedupe_key", dedupe_key)
+        set_(self, "uid", hashlib.sha1(uid_base.encode("utf-8")).hexdigest() + "@cike-events")
+        set_(self, "dtstamp", _DTSTAMP_BASE + timedelta(seconds=stamp_seed % (3600 * 24 * 365)))
+        set_(self, "content_hash", hashlib.sha1(content.encode("utf-8")).hexdigest())
+
+    # Kompatibilita so starším kódom, ktorý s udalosťami pracuje ako so slovníkmi.
+    def __getitem__(self, key):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key in self.FIELDS
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self.FIELDS else default
+
+    def keys(self):
+        return self.FIELDS
+
+    def to_dict(self):
+        return {k: getattr(self, k) for k in self.FIELDS}
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(
+            summary=d.get("summary") or "",
+            start=d["start"],
+            end=d.get("end") or d["start"],
+            source=d.get("source") or "OTHER",
+            location=d.get("location") or "",
+            description=d.get("description") or "",
+            url=d.get("url") or "",
+        )
+
+
+class CarriedEvent(Event):
+    # Udalosť prevzatá z uloženého stavu (plánovač, stránkovanie), nie z tohto behu –
+    # úložisko jej neposúva last_seen.
+    __slots__ = ()
+
+
+def as_event(ev) -> Event:
+    return ev if isinstance(ev, Event) else Event.from_dict(ev)
+
+
+# =========================
+# Stránkovanie
+# =========================
+
+PAGINATION_STATE_PATH = os.path.join(STATE_DIR, "pagination.json")
+_PAGINATION_LOCK = threading.Lock()
+
+
+def _event_to_json(ev):
+    d = dict(ev)
+    d["start"] = ev["start"].isoformat()
+    d["end"] = ev["end"].isoformat()
+    return d
+
+
+def _event_from_json(d):
+    ev = dict(d)
+    ev["start"] = datetime.fromisoformat(d["start"])
+    ev["end"] = datetime.fromisoformat(d["end"])
+    return CarriedEvent.from_dict(ev)
+
+
+def _load_json_state(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_json_state(path, data):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(path + ".tmp", path)
+    except OSError as e:
+        print(f"⚠️ Stav sa nepodarilo uložiť ({path}): {e}")
+
+
+def new_page_stats():
+    return {"total": 0, "stale": 0, "duplicate": 0, "digest": hashlib.sha1()}
+
+
+class PaginationController:
+    # Ukončí prechádzanie stránok, keď (1) stránka obsahuje len udalosti staršie
+    # ako cutoff, (2) len už videné kľúče, alebo (3) sa jej obsah nezmenil od
+    # minulého behu – vtedy sa zvyšok prevezme z uloženého stavu.
+    # Limity strán zostávajú len ako bezpečnostná poistka.
+
+    def __init__(self, name, urls, cutoff=None, reuse_from=0):
+        self.name = name
+        self.urls = list(urls)
+        self.cutoff = cutoff
+        self.reuse_from = reuse_from
+        # Vynútená obnova (--force) nesmie prevziať zvyšok zo stavu – stránky sa prejdú celé.
+        if refresh_forced(name):
+            self.prev = {}
+        else:
+            with _PAGINATION_LOCK:
+                self.prev = _load_json_state(PAGINATION_STATE_PATH).get(name, {})
+        self.pages = {}
+        self.carried = []
+        self.reason = None
+
+    def page(self, url, stats, events, content_hash):
+        self.pages[url] = {"hash": content_hash, "events": [_event_to_json(ev) for ev in events]}
+        total = stats["total"]
+        idx = self.urls.index(url)
+
+        if total and stats["stale"] == total:
+            self.reason = "len staré udalosti"
+        elif total and stats["duplicate"] == total:
+            self.reason = "len videné udalosti"
+        elif idx >= self.reuse_from and self.prev.get(url, {}).get("hash") == content_hash:
+            self.reason = "bez zmeny od minulého behu"
+            self._carry_rest(idx)
+        else:
+            return False
+
+        print(f"   ⏹️ {self.name}: stop na stránke {idx + 1} ({self.reason})")
+        return True
+
+    def _carry_rest(self, idx):
+        for url in self.urls[idx + 1:]:
+            page = self.prev.get(url)
+            if not page:
+                continue
+            self.pages[url] = page
+            for d in page.get("events", []):
+                ev = _event_from_json(d)
+                if self.cutoff is None or ev["start"] >= self.cutoff:
+                    self.carried.append(ev)
+
+    def finish(self):
+        with _PAGINATION_LOCK:
+            state = _load_json_state(PAGINATION_STATE_PATH)
+            state[self.name] = self.pages
+            _save_json_state(PAGINATION_STATE_PATH, state)
+        if self.carried:
+            print(f"   ♻️ {self.name}: prevzatých {len(self.carried)} udalostí z minulého behu")
+        return self.carried
+
+
+# =========================
+# Dvojfázové spracovanie stránok
+# =========================
+# Vlákna sťahujú bajty (iter_pages), parsovanie beží v samostatných procesoch mimo GIL.
+# Procesy vracajú dvojice (kľúč, udalosť) a štatistiky stránky; filter `seen`
+# a rozhodnutia stránkovania zostávajú v hlavnom procese, takže výsledok je rovnaký
+# ako pri parsovaní vo vlákne.
+
+_PARSE_WORKERS_ENV = os.environ.get("CIKE_PARSE_WORKERS", "auto")
+PARSE_WORKERS = (
+    min(4, max(0, (os.cpu_count() or 1) - 1)) if _PARSE_WORKERS_ENV == "auto" else int(_PARSE_WORKERS_ENV)
+)
+PARSE_QUEUE_SIZE = 2   # najviac toľko stiahnutých stránok na zdroj čaká na parsovanie
+
+_PARSE_POOL = None
+_PARSE_POOL_LOCK = threading.Lock()
+
+
+def get_parse_pool():
+    global _PARSE_POOL
+    if PARSE_WORKERS <= 0:
+        return None
+    with _PARSE_POOL_LOCK:
+        if _PARSE_POOL is None:
+            # spawn: fork procesu s bežiacimi vláknami (HTTP, Selenium) nie je bezpečný
+            _PARSE_POOL = ProcessPoolExecutor(max_workers=PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+            atexit.register(_PARSE_POOL.shutdown, wait=False, cancel_futures=True)
+    return _PARSE_POOL
+
+
+def _parse_page(kind, url, body, encoding, source="OTHER", cutoff=None):
+    # Vráti (dvojice (kľúč, udalosť), štatistiky, hex digest stránky, ms parsovania, kandidáti).
+    t0 = time.perf_counter()
+    seen = set()
+    stats = new_page_stats()
+    past = "eventDisplay=past" in url
+    candidates = None
+
+    if kind == "itv":
+        blocks = make_soup(body.decode(encoding, errors="replace"), ITV_STRAINER).find_all("div", class_="e-loop-item")
+        candidates = len(blocks)
+        pairs = extract_itv_events_from_blocks(blocks, seen, stats, keyed=True)
+    elif kind == "jsonld":
+        pairs = _extract_events_from_jsonld(body, source=source, cutoff=cutoff, past=past,
+                                            seen=seen, stats=stats, encoding=encoding, keyed=True)
+    elif kind == "ickk":
+        pairs = _extract_events_from_jsonld(body, source=source, cutoff=cutoff if past else None, past=past,
+                                            seen=seen, stats=stats, encoding=encoding, keyed=True)
+        if not stats["total"]:
+            # textový fallback len pre stránky, kde JSON-LD nemá žiadne podujatie
+            soup = make_ickk_soup(body.decode(encoding, errors="replace"))
+            pairs += _scan_ickk_text(soup, url, cutoff, seen, stats, keyed=True)
+    else:
+        raise ValueError(f"neznámy typ stránky: {kind}")
+
+    digest = stats.pop("digest").hexdigest()
+    return pairs, stats, digest, _elapsed_ms(t0), candidates
+
+
+def _accept_page(pairs, stats, seen):
+    events = []
+    for key, ev in pairs:
+        if key in seen:
+            stats["duplicate"] += 1
+            continue
+        seen.add(key)
+        events.append(ev)
+    return events
+
+
+def iter_parsed_pages(urls, fetch, kind, source="OTHER", cutoff=None):
+    # Vracia (url, výsledok parsovania alebo None) v poradí stránok. Pred spotrebiteľom
+    # je najviac PARSE_QUEUE_SIZE stránok; pri prerušení cyklu sa zvyšok zruší.
+    pool = get_parse_pool()
+    pending = collections.deque()
+
+    def submit(url, resp):
+        if not resp:
+            return None
+        args = (kind, url, resp.content, resp.encoding or "utf-8", source, cutoff)
+        if pool is None:
+            return _parse_page(*args)
+        return pool.submit(_parse_page, *args)
+
+    def result(item):
+        return item.result() if isinstance(item, Future) else item
+
+    # Sťahovanie a parsovanie zdieľajú jedno okno: spolu sú pred spotrebiteľom najviac
+    # PAGE_FETCH_WORKERS - 1 stránok ako bez procesov, takže po prvej prázdnej stránke
+    # sa nesťahuje (a neminie limit hostiteľa) viac než pri sériovom parsovaní.
+    window = PAGE_FETCH_WORKERS if pool is None else max(1, PAGE_FETCH_WORKERS - PARSE_QUEUE_SIZE + 1)
+    pages = iter_pages(urls, fetch, max_workers=window)
+    try:
+        for url, resp in pages:
+            pending.append((url, submit(url, resp)))
+            if len(pending) >= PARSE_QUEUE_SIZE or pool is None:
+                url, item = pending.popleft()
+                yield url, result(item)
+        while pending:
+            url, item = pending.popleft()
+            yield url, result(item)
+    finally:
+        pages.close()
+        for _, item in pending:
+            if isinstance(item, Future):
+                item.cancel()
+
+
 # =========================
 # 1) Košice IT Valley
 # =========================
@@ -212,189 +1083,309 @@ ITV_PAST_PARAM = "e-page-9843d5f"
 ITV_MAX_PAGES = 12
 
 
-def get_itv_blocks(url):
-    r = http_get(url)
-    if not r:
-        return []
-    soup = BeautifulSoup(r.text, "html.parser")
-    return soup.find_all("div", class_="e-loop-item")
-
+def extract_itv_events_from_blocks(blocks, seen, stats, keyed=False):
+    # keyed=True: vráti dvojice (kľúč, udalosť) pre filter `seen` v hlavnom procese.
+    pairs = []
+    for block in blocks:
+        try:
+            title_el = block.find("h2", class_="elementor-heading-title")
+            if not title_el:
+                continue
 
-def scrape_itvalley_events():
-    all_events = []
-    seen = set()
+            title = clean_text(title_el.get_text(" ", strip=True))
+            if not title:
+                continue
 
-    urls = [ITV_BASE] + [f"{ITV_BASE}?{ITV_PAST_PARAM}={i}" for i in range(2, ITV_MAX_PAGES + 1)]
+            desc_el = block.find("div", class_="elementor-widget-theme-post-excerpt")
+            desc = clean_text(desc_el.get_text(" ", strip=True)) if desc_el else ""
 
-    for idx, url in enumerate(urls, start=1):
-        blocks = get_itv_blocks(url)
-        print(f"[ITVALLEY] stránka {idx}: {len(blocks)} blokov")
+            link_el = block.find("a", href=True)
+            link = normalize_event_url(link_el["href"]) if link_el else normalize_event_url(ITV_BASE)
 
-        if not blocks:
-            break
+            icon_widgets = block.find_all("div", class_="elementor-widget-icon-list")
 
-        page_added = 0
+            location = "Košice"
+            start = end = None
 
-        for block in blocks:
-            try:
-                title_el = block.find("h2", class_="elementor-heading-title")
-                if not title_el:
+            for widget in icon_widgets:
+                widget_text = clean_text(widget.get_text(" ", strip=True))
+                if not widget_text:
                     continue
 
-                title = clean_text(title_el.get_text(" ", strip=True))
-                if not title:
-                    continue
+                st, en = parse_numeric_or_sk_date(widget_text)
+                if st:
+                    if not start or (en and en > st):
+                        start, end = st, en
 
-                desc_el = block.find("div", class_="elementor-widget-theme-post-excerpt")
-                desc = clean_text(desc_el.get_text(" ", strip=True)) if desc_el else ""
+                if not re.search(r"\d{1,2}\.\s*\d{1,2}\.\s*\d{4}", widget_text):
+                    if widget_text and len(widget_text) > 2:
+                        location = widget_text
 
-                link_el = block.find("a", href=True)
-                link = normalize_event_url(link_el["href"]) if link_el else normalize_event_url(ITV_BASE)
+            if not start:
+                raw_text = clean_text(" ".join(block.stripped_strings))
+                st, en = parse_numeric_or_sk_date(raw_text)
+                if st:
+                    start, end = st, en
 
-                icon_widgets = block.find_all("div", class_="elementor-widget-icon-list")
+            if not start:
+                continue
 
-                location = "Košice"
-                start = end = None
+            stats["total"] += 1
+            stats["digest"].update(f"{title}|{link}|{start}|{end}|{location}|{desc}".encode("utf-8"))
 
-                for widget in icon_widgets:
-                    widget_text = clean_text(widget.get_text(" ", strip=True))
-                    if not widget_text:
-                        continue
+            key = (link or normalize_key(title, start))
+            if key in seen:
+                stats["duplicate"] += 1
+                continue
 
-                    st, en = parse_numeric_or_sk_date(widget_text)
-                    if st:
-                        if not start or (en and en > st):
-                            start, end = st, en
+            ev = Event(
+                summary=title,
+                location=location,
+                description=(desc + ("\n\n" + link if link else "")).strip(),
+                start=start,
+                end=end or start,
+                source="ITVALLEY",
+                url=link,
+            )
+            seen.add(key)
+            pairs.append((key, ev))
 
-                    if not re.search(r"\d{1,2}\.\s*\d{1,2}\.\s*\d{4}", widget_text):
-                        if widget_text and len(widget_text) > 2:
-                            location = widget_text
+        except Exception as e:
+            print(f"   - chyba ITVALLEY blok: {e}")
 
-                if not start:
-                    raw_text = clean_text(" ".join(block.stripped_strings))
-                    st, en = parse_numeric_or_sk_date(raw_text)
-                    if st:
-                        start, end = st, en
+    return pairs if keyed else [ev for _, ev in pairs]
 
-                if not start:
-                    continue
 
-                key = (link or normalize_key(title, start))
-                if key in seen:
-                    continue
-                seen.add(key)
-
-                all_events.append({
-                    "summary": title,
-                    "location": location,
-                    "description": (desc + ("\n\n" + link if link else "")).strip(),
-                    "start": start,
-                    "end": end or start,
-                    "source": "ITVALLEY",
-                    "url": link,
-                })
-                page_added += 1
+def iter_itvalley_events():
+    # Generátor: udalosti idú von po stránkach, bloky (a ich soup) sa uvoľnia hneď po stránke.
+    seen = set()
+    total = 0
 
-            except Exception as e:
-                print(f"   - chyba ITVALLEY blok: {e}")
+    urls = [ITV_BASE] + [f"{ITV_BASE}?{ITV_PAST_PARAM}={i}" for i in range(2, ITV_MAX_PAGES + 1)]
 
-        print(f"   -> pridané: {page_added}")
+    pager = PaginationController("ITVALLEY", urls, reuse_from=1)
 
-    print(f"✅ ITVALLEY spolu: {len(all_events)} podujatí")
-    return all_events
+    fetch = partial(http_get, force=refresh_forced("ITVALLEY"))
+    for idx, (url, parsed) in enumerate(iter_parsed_pages(urls, fetch, "itv"), start=1):
+        pairs, stats, digest, parse_ms, candidates = parsed or ((), None, None, 0.0, 0)
+        print(f"[ITVALLEY] stránka {idx}: {candidates} blokov")
+
+        if not candidates:
+            break
+
+        page_events = _accept_page(pairs, stats, seen)
+        _metric_page("ITVALLEY", url, parse_ms=parse_ms, candidates=candidates, events=len(page_events),
+                     duplicate=stats["duplicate"], stale=stats["stale"])
+        print(f"   -> pridané: {len(page_events)}")
+
+        stop = pager.page(url, stats, page_events, digest)
+        total += len(page_events)
+        yield from page_events
+        if stop:
+            break
+
+    carried = pager.finish()
+    yield from carried
+    print(f"✅ ITVALLEY spolu: {total + len(carried)} podujatí")
+
+
+def scrape_itvalley_events():
+    return list(iter_itvalley_events())
 
 
 # =========================
 # 2) AmCham
 # =========================
+# Zber bez prehliadača (priame volanie "load more" XHR) je zablokovaný, kým nahrávka
+# (--record) živej stránky neukáže skutočný endpoint a parametre; dovtedy Selenium.
 
-def scrape_amcham_events():
-    url = "https://amcham.sk/events"
+AMCHAM_URL = "https://amcham.sk/events"
+AMCHAM_MAX_LOAD_MORE = 60
+AMCHAM_UPCOMING_CSS = "#event-list-upcoming--24"
+AMCHAM_PAST_CSS = "[id^='event-list-past-year-']"
+
+AMCHAM_REUSE_DRIVER = os.environ.get("CIKE_AMCHAM_REUSE_DRIVER", "0") == "1"
+AMCHAM_WAIT_TIMEOUT = 12
+AMCHAM_BUTTON_TIMEOUT = 3
+AMCHAM_MAX_STALLS = 2
+# CSS sa neblokuje: tlačidlá skryté len štýlom by inak is_displayed() hlásilo ako viditeľné.
+AMCHAM_BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+]
+
+_AMCHAM_DRIVER = None
+_AMCHAM_DRIVER_LOCK = threading.Lock()
+
+
+def _build_amcham_driver():
     options = Options()
     options.add_argument("--headless=new")
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.managed_default_content_settings.fonts": 2,
+    })
+    options.page_load_strategy = "eager"
 
     driver = webdriver.Chrome(options=options)
-    wait = WebDriverWait(driver, 12)
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": AMCHAM_BLOCKED_URLS})
+    except Exception as e:
+        print(f"⚠️ AmCham: CDP blokovanie zdrojov nedostupné: {e}")
+    return driver
 
-    driver.get(url)
-    events, seen = [], set()
 
-    while True:
+def get_amcham_driver():
+    global _AMCHAM_DRIVER
+    if not AMCHAM_REUSE_DRIVER:
+        return _build_amcham_driver()
+    if _AMCHAM_DRIVER is None:
+        _AMCHAM_DRIVER = _build_amcham_driver()
+    return _AMCHAM_DRIVER
+
+
+def close_amcham_driver():
+    global _AMCHAM_DRIVER
+    if _AMCHAM_DRIVER is not None:
         try:
-            load_more = wait.until(EC.element_to_be_clickable((By.ID, "data-load-more")))
-            driver.execute_script("arguments[0].scrollIntoView({block:'center'});", load_more)
-            driver.execute_script("arguments[0].click();", load_more)
-            time.sleep(1.0)
+            _AMCHAM_DRIVER.quit()
         except Exception:
-            break
+            pass
+        _AMCHAM_DRIVER = None
+
+
+atexit.register(close_amcham_driver)
+
 
-    soup = BeautifulSoup(driver.page_source, "html.parser")
-    up_cont = soup.select_one("#event-list-upcoming--24")
+def _amcham_count(driver, css):
+    return len(driver.find_elements(By.CSS_SELECTOR, f"{css} .event-item"))
+
+
+def _amcham_button_visible(btn):
+    try:
+        style = (btn.get_attribute("style") or "").replace(" ", "").lower()
+        return "display:none" not in style and btn.is_displayed()
+    except StaleElementReferenceException:
+        return False
+
+
+def _amcham_clickable(driver, css):
+    # Pri eager načítaní môže JS tlačidlo vložiť až neskôr – krátko naň počká.
+    try:
+        return WebDriverWait(driver, AMCHAM_BUTTON_TIMEOUT, poll_frequency=0.1).until(
+            EC.element_to_be_clickable((By.CSS_SELECTOR, css))
+        )
+    except TimeoutException:
+        return None
+
+
+def _amcham_click_and_wait(driver, btn, css, before):
+    # Namiesto pevných pauz čaká, kým pribudnú .event-item alebo tlačidlo zmizne.
+    driver.execute_script("arguments[0].scrollIntoView({block:'center'}); arguments[0].click();", btn)
+    try:
+        WebDriverWait(driver, AMCHAM_WAIT_TIMEOUT, poll_frequency=0.1).until(
+            lambda d: _amcham_count(d, css) > before or not _amcham_button_visible(btn)
+        )
+        return True
+    except TimeoutException:
+        return False
+
+
+def _scrape_amcham_replay():
+    # Bez prehliadača: rovnaká extrakcia nad nahratými snímkami page_source.
+    events, seen = [], set()
+    up_cont = make_soup(TRANSPORT.snapshot("amcham-upcoming")).select_one(AMCHAM_UPCOMING_CSS)
     events += extract_amcham_events_from_soup([up_cont] if up_cont else [], seen)
-    print(f"✅ AmCham Upcoming: {len(events)}")
+    past_cont = make_soup(TRANSPORT.snapshot("amcham-past")).select_one(AMCHAM_PAST_CSS)
+    events += extract_amcham_events_from_soup([past_cont] if past_cont else [], seen)
+    print(f"✅ AmCham spolu: {len(events)} podujatí (nahrávka)")
+    return events
 
+
+def scrape_amcham_events():
+    if isinstance(TRANSPORT, ReplayTransport):
+        return _scrape_amcham_replay()
+    if AMCHAM_REUSE_DRIVER:
+        with _AMCHAM_DRIVER_LOCK:
+            return _scrape_amcham_with_driver(get_amcham_driver())
+
+    driver = get_amcham_driver()
     try:
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(0.8)
+        return _scrape_amcham_with_driver(driver)
+    finally:
+        driver.quit()
 
-        try:
-            past_tab = wait.until(EC.element_to_be_clickable(
-                (By.CSS_SELECTOR, "#select-past-year, [data-bs-target='#tab-event-list-past-year']")))
-            driver.execute_script("arguments[0].click();", past_tab)
-            time.sleep(0.8)
-        except TimeoutException:
-            pass
 
-        cont_el = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "[id^='event-list-past-year-']")))
+def _scrape_amcham_with_driver(driver):
+    wait = WebDriverWait(driver, AMCHAM_WAIT_TIMEOUT, poll_frequency=0.1)
+    phases = {}
+    events, seen = [], set()
+
+    t0 = time.monotonic()
+    driver.get(AMCHAM_URL)
+    try:
+        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, AMCHAM_UPCOMING_CSS)))
+
+        stalls = 0
+        for _ in range(AMCHAM_MAX_LOAD_MORE):
+            btn = _amcham_clickable(driver, "#data-load-more")
+            if not btn or not _amcham_button_visible(btn):
+                break
+            try:
+                loaded = _amcham_click_and_wait(driver, btn, AMCHAM_UPCOMING_CSS, _amcham_count(driver, AMCHAM_UPCOMING_CSS))
+            except StaleElementReferenceException:
+                continue
+            stalls = 0 if loaded else stalls + 1
+            if stalls >= AMCHAM_MAX_STALLS:
+                break
+    except Exception as e:
+        print(f"⚠️ AmCham Upcoming: načítavanie prerušené ({type(e).__name__}), spracujem načítané")
+
+    soup = make_soup(TRANSPORT.page_source("amcham-upcoming", driver))
+    up_cont = soup.select_one(AMCHAM_UPCOMING_CSS)
+    events += extract_amcham_events_from_soup([up_cont] if up_cont else [], seen)
+    phases["upcoming"] = time.monotonic() - t0
+    print(f"✅ AmCham Upcoming: {len(events)}")
+
+    try:
+        t0 = time.monotonic()
+        past_tab = _amcham_clickable(driver, "#select-past-year, [data-bs-target='#tab-event-list-past-year']")
+        if past_tab:
+            driver.execute_script("arguments[0].scrollIntoView({block:'center'}); arguments[0].click();", past_tab)
+
+        cont_el = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, AMCHAM_PAST_CSS)))
         cont_id = cont_el.get_attribute("id")
+        cont_css = f"#{cont_id}"
+        phases["past-tab"] = time.monotonic() - t0
 
         def find_load_more_for_container():
             css = (
                 f"#tab-event-list-past-year #data-load-more[data-target='{cont_id}'], "
                 f"[id^='tab-event-list-past-year'] #data-load-more[data-target='{cont_id}']"
             )
-            btns = driver.find_elements(By.CSS_SELECTOR, css)
-            return btns[0] if btns else None
-
-        last_count = 0
-        stall_hits = 0
-        max_stalls = 3
-
-        for _ in range(60):
-            curr_count = len(driver.find_elements(By.CSS_SELECTOR, f"#{cont_id} .event-item"))
-            stall_hits = (stall_hits + 1) if curr_count == last_count else 0
-            last_count = curr_count
+            return _amcham_clickable(driver, css)
 
+        t0 = time.monotonic()
+        stalls = 0
+        for _ in range(AMCHAM_MAX_LOAD_MORE):
             btn = find_load_more_for_container()
-            if not btn:
-                break
-
-            style = (btn.get_attribute("style") or "").replace(" ", "").lower()
-            if "display:none" in style:
+            if not btn or not _amcham_button_visible(btn):
                 break
-
             try:
-                driver.execute_script("arguments[0].scrollIntoView({block:'center'});", btn)
-                driver.execute_script("arguments[0].click();", btn)
+                loaded = _amcham_click_and_wait(driver, btn, cont_css, _amcham_count(driver, cont_css))
             except StaleElementReferenceException:
-                btn = find_load_more_for_container()
-                if not btn:
-                    break
-                driver.execute_script("arguments[0].scrollIntoView({block:'center'});", btn)
-                driver.execute_script("arguments[0].click();", btn)
-
-            try:
-                wait.until(lambda d: len(d.find_elements(By.CSS_SELECTOR, f"#{cont_id} .event-item")) > curr_count)
-            except TimeoutException:
-                if stall_hits >= max_stalls:
-                    break
-
-            time.sleep(0.8)
+                continue
+            stalls = 0 if loaded else stalls + 1
+            if stalls >= AMCHAM_MAX_STALLS:
+                break
+        phases["load-more"] = time.monotonic() - t0
 
-        soup_past = BeautifulSoup(driver.page_source, "html.parser")
-        past_container = soup_past.select_one(f"#{cont_id}")
+        soup_past = make_soup(TRANSPORT.page_source("amcham-past", driver))
+        past_container = soup_past.select_one(cont_css)
         new_events = extract_amcham_events_from_soup([past_container] if past_container else [], seen)
         events += new_events
         print(f"✅ AmCham Past (Last Year): {len(new_events)}")
@@ -402,7 +1393,9 @@ def scrape_amcham_events():
     except Exception:
         pass
 
-    driver.quit()
+    print("⏱️ AmCham fázy: " + ", ".join(f"{k} {v:.1f}s" for k, v in phases.items()))
+    if METRICS:
+        METRICS.source("AMCHAM", browser_phases={k: round(v, 2) for k, v in phases.items()})
     print(f"✅ AmCham spolu: {len(events)} podujatí")
     return events
 
@@ -525,7 +1518,7 @@ def extract_amcham_events_from_soup(containers, seen):
                 continue
 
             link_el = block.find("a", href=True)
-            link = normalize_event_url(link_el["href"]) if link_el else "https://amcham.sk/events"
+            link = normalize_event_url(link_el["href"]) if link_el else AMCHAM_URL
 
             key = link or normalize_key(title, start)
             if key in seen:
@@ -539,15 +1532,15 @@ def extract_amcham_events_from_soup(containers, seen):
             desc_el = block.select_one(".event-shortdesc")
             desc = clean_text(desc_el.get_text(" ", strip=True)) if desc_el else ""
 
-            events.append({
-                "summary": title,
-                "location": location,
-                "description": f"{desc}\n\n{link}".strip(),
-                "start": start,
-                "end": end,
-                "source": "AMCHAM",
-                "url": link,
-            })
+            events.append(Event(
+                summary=title,
+                location=location,
+                description=f"{desc}\n\n{link}".strip(),
+                start=start,
+                end=end,
+                source="AMCHAM",
+                url=link,
+            ))
 
     return events
 
@@ -576,21 +1569,56 @@ def _parse_iso_to_naive(dtstr: str):
     return None
 
 
-def _clean_text(s: str):
+# Rýchla cesta bez DOM: JSON-LD bloky sa vyberú priamo z bajtov odpovede
+# a HTML z popisov sa odstráni rozdelením na značky.
+_JSONLD_SCRIPT_RE = re.compile(
+    rb"<script\b[^>]*?\btype\s*=\s*[\"']?application/ld\+json[\"']?[^>]*>(.*?)</script\s*>",
+    re.IGNORECASE | re.DOTALL,
+)
+_HTML_TAG_RE = re.compile(r"<(?:/?[A-Za-z][^>]*|![^>]*)>")
+_NEEDS_DOM_RE = re.compile(r"<(?:script|style)\b|<!--|<!\[CDATA\[", re.IGNORECASE)
+
+
+def _clean_text_dom(s: str):
     try:
         return BeautifulSoup(html.unescape(s or ""), "html.parser").get_text(" ", strip=True)
     except Exception:
         return (s or "").strip()
 
 
-def _extract_events_from_jsonld(soup, source="OTHER", cutoff=None, past=False, seen=None):
-    events = []
-    seen = seen or set()
-
-    for sc in soup.find_all("script", {"type": "application/ld+json"}):
-        raw = (sc.string or sc.text or "").strip()
+def _clean_text(s: str):
+    s = html.unescape(s or "")
+    if "<" not in s and "&" not in s:
+        return s.strip()
+    if _NEEDS_DOM_RE.search(s):
+        return _clean_text_dom(s)
+    pieces = (html.unescape(p).strip() for p in _HTML_TAG_RE.split(s))
+    return " ".join(p for p in pieces if p)
+
+
+def _iter_jsonld_payloads(doc, encoding=None):
+    if isinstance(doc, (bytes, bytearray)):
+        for m in _JSONLD_SCRIPT_RE.finditer(doc):
+            yield m.group(1).decode(encoding or "utf-8", errors="replace").strip()
+        return
+    if isinstance(doc, str):
+        doc = make_soup(doc, JSONLD_STRAINER)
+    for sc in doc.find_all("script", {"type": "application/ld+json"}):
+        yield (sc.string or sc.text or "").strip()
+
+
+def _extract_events_from_jsonld(doc, source="OTHER", cutoff=None, past=False, seen=None, stats=None,
+                                encoding=None, keyed=False):
+    # doc: surové bajty odpovede (rýchla cesta) alebo hotový soup / HTML text (záloha)
+    pairs = []
+    if seen is None:
+        seen = set()
+
+    for raw in _iter_jsonld_payloads(doc, encoding):
         if not raw:
             continue
+        if stats is not None:
+            stats["digest"].update(raw.encode("utf-8"))
 
         try:
             data = json.loads(raw)
@@ -618,14 +1646,20 @@ def _extract_events_from_jsonld(soup, source="OTHER", cutoff=None, past=False, s
             if not start_dt:
                 continue
 
+            if stats is not None:
+                stats["total"] += 1
+
             if past and cutoff and start_dt < cutoff:
+                if stats is not None:
+                    stats["stale"] += 1
                 continue
 
             url = normalize_event_url((it.get("url") or "").strip())
             key = url or (re.sub(r"\s+", " ", title.lower()).strip(), start_dt.date())
             if key in seen:
+                if stats is not None:
+                    stats["duplicate"] += 1
                 continue
-            seen.add(key)
 
             location = ""
             loc = it.get("location")
@@ -644,75 +1678,100 @@ def _extract_events_from_jsonld(soup, source="OTHER", cutoff=None, past=False, s
 
             desc = _clean_text(it.get("description") or "")
 
-            events.append({
-                "summary": title,
-                "location": location,
-                "description": (desc + ("\n\n" + url if url else "")).strip(),
-                "start": start_dt,
-                "end": end_dt if end_dt >= start_dt else start_dt,
-                "source": normalize_source(source),
-                "url": url,
-            })
+            seen.add(key)
+            pairs.append((key, Event(
+                summary=title,
+                location=location,
+                description=(desc + ("\n\n" + url if url else "")).strip(),
+                start=start_dt,
+                end=end_dt if end_dt >= start_dt else start_dt,
+                source=normalize_source(source),
+                url=url,
+            )))
 
-    return events
+    return pairs if keyed else [ev for _, ev in pairs]
+
+
+def _sopk_get(url, force=False):
+    return http_get(url, verify=not SOPK_ALLOW_INSECURE_SSL, force=force)
 
 
-def _crawl_sopk_future():
+def _iter_sopk_future():
     pages = [SOPK_BASE] + [urljoin(SOPK_BASE, f"page/{i}/") for i in range(2, SOPK_MAX_PAGES_FUTURE + 1)]
-    all_events, seen = [], set()
+    seen = set()
+    pager = PaginationController("SOPK-future", pages, reuse_from=len(pages))
 
-    for idx, url in enumerate(pages, start=1):
+    fetch = partial(_sopk_get, force=refresh_forced("SOPK-future"))
+    for idx, (url, parsed) in enumerate(iter_parsed_pages(pages, fetch, "jsonld", source="SOPK"), start=1):
         print(f"   • SOPK future[{idx}]: {url}")
-        resp = http_get(url, verify=not SOPK_ALLOW_INSECURE_SSL)
-        if not resp:
+        if not parsed:
             break
 
-        soup = BeautifulSoup(resp.text, "html.parser")
-        found = _extract_events_from_jsonld(soup, source="SOPK", past=False, seen=seen)
+        pairs, stats, digest, parse_ms, _ = parsed
+        found = _accept_page(pairs, stats, seen)
+        _metric_page("SOPK", url, parse_ms=parse_ms, events=len(found),
+                     duplicate=stats["duplicate"], stale=stats["stale"])
 
         if found:
-            all_events.extend(found)
             print(f"     -> {len(found)} eventov")
         else:
             print("     -> 0 eventov (žiadny JSON-LD)")
 
-    return all_events
+        stop = pager.page(url, stats, found, digest)
+        yield from found
+        if stop:
+            break
+
+    yield from pager.finish()
 
 
-def _crawl_sopk_past():
+def _iter_sopk_past():
     past_pages = [SOPK_BASE + "?eventDisplay=past"] + \
                  [SOPK_BASE + f"page/{i}/?eventDisplay=past" for i in range(2, SOPK_PAST_MAX_PAGE + 1)]
 
-    all_events, seen = [], set()
-    cutoff = datetime.now() - timedelta(days=SOPK_PAST_DAYS)
+    seen = set()
+    cutoff = _past_cutoff(SOPK_PAST_DAYS)
+    pager = PaginationController("SOPK-past", past_pages, cutoff=cutoff)
 
-    for idx, url in enumerate(past_pages, start=1):
+    fetch = partial(_sopk_get, force=refresh_forced("SOPK-past"))
+    for idx, (url, parsed) in enumerate(iter_parsed_pages(past_pages, fetch, "jsonld", source="SOPK", cutoff=cutoff), start=1):
         print(f"   • SOPK past[{idx}]: {url}")
-        resp = http_get(url, verify=not SOPK_ALLOW_INSECURE_SSL)
-        if not resp:
+        if not parsed:
             break
 
-        soup = BeautifulSoup(resp.text, "html.parser")
-        found = _extract_events_from_jsonld(soup, source="SOPK", cutoff=cutoff, past=True, seen=seen)
+        pairs, stats, digest, parse_ms, _ = parsed
+        found = _accept_page(pairs, stats, seen)
+        _metric_page("SOPK", url, parse_ms=parse_ms, events=len(found),
+                     duplicate=stats["duplicate"], stale=stats["stale"])
 
         if found:
-            all_events.extend(found)
             print(f"     -> {len(found)} eventov")
         else:
             print("     -> 0 eventov (žiadny JSON-LD)")
 
-    return all_events
+        stop = pager.page(url, stats, found, digest)
+        yield from found
+        if stop:
+            break
 
+    yield from pager.finish()
 
-def scrape_sopk_events():
+
+def iter_sopk_events():
+    total = 0
     print("🔹 SOPK – budúce podujatia…")
-    future_events = _crawl_sopk_future()
+    for ev in scheduled_iter("SOPK-future", _iter_sopk_future):
+        total += 1
+        yield ev
     print("🔹 SOPK – minulé podujatia…")
-    past_events = _crawl_sopk_past()
+    for ev in scheduled_iter("SOPK-past", _iter_sopk_past):
+        total += 1
+        yield ev
+    print(f"✅ SOPK spolu: {total} podujatí")
 
-    events = future_events + past_events
-    print(f"✅ SOPK spolu: {len(events)} podujatí")
-    return events
+
+def scrape_sopk_events():
+    return list(iter_sopk_events())
 
 
 # =========================
@@ -724,126 +1783,503 @@ ICKK_PAST_DAYS = 365
 ICKK_PAST_MAX_PAGE = 8
 
 
-def scrape_ickk_events():
-    all_events = []
-    seen = set()
-    cutoff = datetime.now() - timedelta(days=ICKK_PAST_DAYS)
+_ICKK_CONTAINER_RE = re.compile(r"(?:^|\s)tribe-events-(?:l-container|calendar-list)(?:\s|$)")
+ICKK_STRAINER = SoupStrainer(class_=_ICKK_CONTAINER_RE)
+ICKK_DATE_LOOKBACK = 3
 
-    urls = [ICKK_LIST_BASE]
-    urls.append(f"{ICKK_LIST_BASE}?eventDisplay=past")
-    for i in range(2, ICKK_PAST_MAX_PAGE + 1):
-        urls.append(f"{ICKK_LIST_BASE}page/{i}/?eventDisplay=past")
+_ICKK_TIME_RE = re.compile(r"\d{1,2}:\d{2}")
+_ICKK_DIGIT_RE = re.compile(r"\d")
+_ICKK_URL_RE = re.compile(r"https?://\S+")
+
+
+def make_ickk_soup(markup):
+    # Len zoznam podujatí (bez hlavičky, menu a pätičky); ak kontajner chýba, celá stránka.
+    soup = make_soup(markup, ICKK_STRAINER)
+    if soup.find(class_=_ICKK_CONTAINER_RE) is None:
+        soup = make_soup(markup)
+    return soup
+
+
+def _ickk_line_date(line):
+    if not _ICKK_DIGIT_RE.search(line):
+        return None, None
+    try:
+        return parse_numeric_or_sk_date(line)
+    except ValueError:
+        return None, None
+
+
+def _scan_ickk_text(soup, url, cutoff, seen, stats=None, keyed=False):
+    pairs = []
+    root = soup.find(class_=_ICKK_CONTAINER_RE) or soup
+    text_lines = [x for x in map(clean_text, root.get_text("\n").splitlines()) if x]
+    is_past = "eventDisplay=past" in url
+
+    # Jeden prechod dopredu: dátum každého riadku sa parsuje najviac raz a posledné
+    # ICKK_DATE_LOOKBACK výsledky slúžia ako kontext pre riadok s časom bez dátumu.
+    recent = collections.deque(maxlen=ICKK_DATE_LOOKBACK)
+    for i, line in enumerate(text_lines):
+        line_date = _ickk_line_date(line)
+        start_date, end_date = line_date
+        title = text_lines[i + 1] if i + 1 < len(text_lines) else ""
+        is_candidate = "@" in line and _ICKK_TIME_RE.search(line) and len(title) >= 3
+
+        if is_candidate and not start_date:
+            for st, en in reversed(recent):
+                if st:
+                    start_date, end_date = st, en
+                    break
+        recent.append(line_date)
 
-    for idx, url in enumerate(urls, start=1):
-        r = http_get(url)
-        if not r:
+        if not is_candidate or not start_date:
             continue
 
-        soup = BeautifulSoup(r.text, "html.parser")
+        tr = parse_time_range(line)
+        if tr:
+            sh, sm, eh, em = tr
+            start_dt = start_date.replace(hour=sh, minute=sm)
+            end_dt = start_date.replace(hour=eh, minute=em)
+            if end_dt < start_dt:
+                end_dt = start_dt
+        else:
+            start_dt = start_date
+            end_dt = end_date or start_date
+
+        location = ""
+        desc = ""
+
+        if i + 2 < len(text_lines):
+            possible_location = text_lines[i + 2]
+            if len(possible_location) < 180:
+                location = possible_location
+
+        if i + 3 < len(text_lines):
+            possible_desc = text_lines[i + 3]
+            if possible_desc != location:
+                desc = possible_desc
+
+        if stats is not None:
+            stats["total"] += 1
+            stats["digest"].update(f"{title}|{start_dt}|{end_dt}|{location}|{desc}".encode("utf-8"))
+
+        if is_past and start_dt < cutoff:
+            if stats is not None:
+                stats["stale"] += 1
+            continue
+
+        event_url = ""
+        m_url = _ICKK_URL_RE.search(desc + " " + line)
+        if m_url:
+            event_url = normalize_event_url(m_url.group(0))
 
-        found_jsonld = _extract_events_from_jsonld(
-            soup,
+        key = event_url or normalize_key(title, start_dt)
+        if key in seen:
+            if stats is not None:
+                stats["duplicate"] += 1
+            continue
+
+        full_desc = (desc + ("\n\n" + event_url if event_url else "\n\n" + url)).strip()
+
+        seen.add(key)
+        pairs.append((key, Event(
+            summary=title,
+            location=location,
+            description=full_desc,
+            start=start_dt,
+            end=end_dt,
             source="ICKK",
-            cutoff=cutoff if "eventDisplay=past" in url else None,
-            past="eventDisplay=past" in url,
-            seen=seen,
-        )
+            url=event_url or normalize_event_url(url),
+        )))
 
-        page_added = 0
-        if found_jsonld:
-            all_events.extend(found_jsonld)
-            page_added += len(found_jsonld)
+    return pairs if keyed else [ev for _, ev in pairs]
 
-        text_lines = [clean_text(line) for line in soup.get_text("\n").splitlines()]
-        text_lines = [x for x in text_lines if x]
 
-        i = 0
-        while i < len(text_lines):
-            line = text_lines[i]
-            has_time = "@" in line and re.search(r"\d{1,2}:\d{2}", line)
+def _iter_ickk(job, urls, cutoff, seen, pager=None):
+    fetch = partial(http_get, force=refresh_forced(job))
+    parsed_pages = iter_parsed_pages(urls, fetch, "ickk", source="ICKK", cutoff=cutoff)
+    for idx, (url, parsed) in enumerate(parsed_pages, start=1):
+        if not parsed:
+            continue
 
-            if not has_time:
-                i += 1
-                continue
+        pairs, stats, digest, parse_ms, _ = parsed
+        page_events = _accept_page(pairs, stats, seen)
 
-            event_datetime_line = line
-            title = text_lines[i + 1] if i + 1 < len(text_lines) else ""
-            if not title or len(title) < 3:
-                i += 1
-                continue
+        _metric_page("ICKK", url, parse_ms=parse_ms, events=len(page_events),
+                     duplicate=stats["duplicate"], stale=stats["stale"])
+        print(f"[ICKK] stránka {idx}: {url}")
+        print(f"   -> pridané: {len(page_events)}")
 
-            start_date, end_date = parse_numeric_or_sk_date(event_datetime_line)
+        stop = pager is not None and pager.page(url, stats, page_events, digest)
+        yield from page_events
+        if stop:
+            break
 
-            if not start_date:
-                for back in range(1, 4):
-                    if i - back >= 0:
-                        st, en = parse_numeric_or_sk_date(text_lines[i - back])
-                        if st:
-                            start_date, end_date = st, en
-                            break
+    if pager is not None:
+        yield from pager.finish()
 
-            if not start_date:
-                i += 1
-                continue
 
-            tr = parse_time_range(event_datetime_line)
-            if tr:
-                sh, sm, eh, em = tr
-                start_dt = start_date.replace(hour=sh, minute=sm)
-                end_dt = start_date.replace(hour=eh, minute=em)
-                if end_dt < start_dt:
-                    end_dt = start_dt
-            else:
-                start_dt = start_date
-                end_dt = end_date or start_date
+def _iter_ickk_upcoming():
+    return _iter_ickk("ICKK-upcoming", [ICKK_LIST_BASE], _past_cutoff(ICKK_PAST_DAYS), set())
 
-            location = ""
-            desc = ""
 
-            if i + 2 < len(text_lines):
-                possible_location = text_lines[i + 2]
-                if len(possible_location) < 180:
-                    location = possible_location
+def _iter_ickk_past():
+    urls = [f"{ICKK_LIST_BASE}?eventDisplay=past"]
+    for i in range(2, ICKK_PAST_MAX_PAGE + 1):
+        urls.append(f"{ICKK_LIST_BASE}page/{i}/?eventDisplay=past")
+
+    cutoff = _past_cutoff(ICKK_PAST_DAYS)
+    pager = PaginationController("ICKK-past", urls, cutoff=cutoff)
+    return _iter_ickk("ICKK-past", urls, cutoff, set(), pager)
 
-            if i + 3 < len(text_lines):
-                possible_desc = text_lines[i + 3]
-                if possible_desc != location:
-                    desc = possible_desc
 
-            if "eventDisplay=past" in url and start_dt < cutoff:
-                i += 1
-                continue
+def iter_ickk_events():
+    # Budúce a minulé stránky sú samostatné úlohy plánovača (minulé stačí raz za týždeň);
+    # duplicity medzi nimi odstráni deduplikácia pri exporte.
+    total = 0
+    for job, fn in (("ICKK-upcoming", _iter_ickk_upcoming), ("ICKK-past", _iter_ickk_past)):
+        for ev in scheduled_iter(job, fn):
+            total += 1
+            yield ev
+    print(f"✅ ICKK spolu: {total} podujatí")
 
-            event_url = ""
-            m_url = re.search(r"https?://\S+", desc + " " + event_datetime_line)
-            if m_url:
-                event_url = normalize_event_url(m_url.group(0))
 
-            key = event_url or normalize_key(title, start_dt)
-            if key in seen:
-                i += 1
+def scrape_ickk_events():
+    return list(iter_ickk_events())
+
+
+# =========================
+# Obohatenie z detailu podujatia
+# =========================
+
+ENRICH_ENABLED = os.environ.get("CIKE_ENRICH", "0") == "1"
+ENRICH_WORKERS = 4
+ENRICH_CACHE_PATH = os.path.join(STATE_DIR, "enrich.json")
+ENRICH_GENERIC_LOCATIONS = ("", "Košice")
+
+_DETAIL_TIME_RE = re.compile(r"\b(\d{1,2})[:.](\d{2})\s*(?:h\s*)?[-–]\s*(\d{1,2})[:.](\d{2})\b")
+_DETAIL_CONTENT_CSS = (
+    ".elementor-widget-theme-post-content, .tribe-events-single-event-description, "
+    ".event-detail, article, main"
+)
+
+
+def _listing_url_re():
+    # Zoznamové stránky aj ich stránkovanie (…/page/N, query sa normalizáciou odstráni)
+    # a AmCham load-more; ICKK textové udalosti nesú ako url práve takúto stránku.
+    bases = "|".join(re.escape(normalize_event_url(u)) for u in (ITV_BASE, SOPK_BASE, ICKK_LIST_BASE, AMCHAM_URL))
+    return re.compile(rf"(?:{bases})(?:/page/\d+|/load-more)?")
+
+
+def extract_event_detail(page_text, source="OTHER"):
+    soup = make_soup(page_text)
+    detail = {}
+
+    found = _extract_events_from_jsonld(soup, source=source)
+    if found:
+        ev = found[0]
+        if not ev.all_day:
+            detail["start"], detail["end"] = ev.start.isoformat(), ev.end.isoformat()
+        if ev.location:
+            detail["location"] = ev.location
+        desc = ev.description.split("\n\n")[0] if ev.url else ev.description
+        if desc:
+            detail["description"] = desc
+
+    content = soup.select_one(_DETAIL_CONTENT_CSS)
+    if content is not None:
+        text = clean_text(content.get_text(" ", strip=True))
+        if "start" not in detail:
+            m = _DETAIL_TIME_RE.search(text)
+            if m:
+                detail["time"] = [int(x) for x in m.groups()]
+        if "description" not in detail and text:
+            detail["description"] = text[:2000]
+
+    return detail
+
+
+def _apply_event_detail(ev, detail):
+    start, end = ev.start, ev.end
+    if "start" in detail:
+        d_start = datetime.fromisoformat(detail["start"])
+        d_end = datetime.fromisoformat(detail["end"])
+        if d_start.date() == ev.start.date():
+            start, end = d_start, max(d_end, d_start)
+    elif "time" in detail and ev.all_day and ev.start.date() == ev.end.date():
+        sh, sm, eh, em = detail["time"]
+        try:
+            start = ev.start.replace(hour=sh, minute=sm)
+            end = ev.start.replace(hour=eh, minute=em)
+        except ValueError:
+            start, end = ev.start, ev.end
+        if end < start:
+            end = start
+
+    location = ev.location
+    if detail.get("location") and ev.location in ENRICH_GENERIC_LOCATIONS:
+        location = detail["location"]
+
+    description = ev.description
+    body = ev.description.split("\n\n" + ev.url)[0] if ev.url else ev.description
+    if len(detail.get("description", "")) > len(body):
+        description = (detail["description"] + ("\n\n" + ev.url if ev.url else "")).strip()
+
+    return replace(ev, start=start, end=end, location=location, description=description)
+
+
+def enrich_events(events, workers=ENRICH_WORKERS):
+    # Len celodenné udalosti s vlastnou URL; výsledky sa cachujú podľa URL a hashu obsahu,
+    # takže ďalší beh platí požiadavkou iba za nové alebo zmenené udalosti.
+    events = [as_event(ev) for ev in events]
+    cache = _load_json_state(ENRICH_CACHE_PATH)
+    listing = _listing_url_re()
+
+    todo = {}
+    for ev in events:
+        if not ev.all_day or not ev.norm_url or listing.fullmatch(ev.norm_url):
+            continue
+        entry = cache.get(ev.norm_url)
+        if not entry or entry.get("hash") != ev.content_hash:
+            todo.setdefault(ev.norm_url, ev)
+
+    fetched = 0
+    for url, resp in iter_pages(list(todo), http_get, max_workers=workers):
+        if not resp:
+            continue
+        try:
+            detail = extract_event_detail(resp.content, todo[url].source)
+        except Exception as e:
+            print(f"   - chyba detailu {url}: {e}")
+            continue
+        cache[url] = {"hash": todo[url].content_hash, "detail": detail}
+        fetched += 1
+
+    out, enriched = [], 0
+    for ev in events:
+        entry = cache.get(ev.norm_url) if ev.all_day and ev.norm_url else None
+        if entry and entry.get("hash") == ev.content_hash and entry.get("detail"):
+            new_ev = _apply_event_detail(ev, entry["detail"])
+            enriched += new_ev != ev
+            ev = new_ev
+        out.append(ev)
+
+    _save_json_state(ENRICH_CACHE_PATH, cache)
+    print(f"🔎 Obohatenie: stiahnutých {fetched} detailov, upravených {enriched} udalostí")
+    return out
+
+
+# =========================
+# Úložisko udalostí (SQLite)
+# =========================
+
+EVENT_STORE_ENABLED = os.environ.get("CIKE_EVENT_STORE", "1") != "0"
+EVENT_STORE_PATH = os.path.join(STATE_DIR, "events.sqlite")
+# > 0: minulé stránky sa prechádzajú len za posledných N dní, archív drží úložisko.
+STORE_REFRESH_DAYS = int(os.environ.get("CIKE_REFRESH_DAYS", "0"))
+# Záznam zdroja, ktorý v jeho obnovenom okne nebol videný N dní, sa z úložiska vymaže.
+STORE_PRUNE_DAYS = int(os.environ.get("CIKE_STORE_PRUNE_DAYS", "14"))
+
+_EVENT_STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    uid TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    location TEXT NOT NULL,
+    description TEXT NOT NULL,
+    url TEXT NOT NULL,
+    start TEXT NOT NULL,
+    "end" TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+)
+"""
+
+_EVENT_STORE_UPSERT = """
+INSERT INTO events (uid, source, summary, location, description, url, start, "end",
+                    content_hash, first_seen, last_seen)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(uid) DO UPDATE SET
+    source = excluded.source,
+    summary = excluded.summary,
+    location = excluded.location,
+    description = excluded.description,
+    url = excluded.url,
+    start = excluded.start,
+    "end" = excluded."end",
+    content_hash = excluded.content_hash,
+    last_seen = CASE WHEN ? THEN excluded.last_seen ELSE events.last_seen END
+"""
+STORE_BATCH_SIZE = 500
+
+
+class EventStore:
+    def __init__(self, path=EVENT_STORE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(_EVENT_STORE_SCHEMA)
+        self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS run_uids (uid TEXT PRIMARY KEY)")
+        self.conn.commit()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    def upsert(self, events, seen_at=None):
+        # last_seen sa posúva len udalostiam z aktuálneho zberu (nie CarriedEvent);
+        # stats["windows"] = najskorší začiatok zozbieranej udalosti podľa zdroja.
+        seen_at = (seen_at or datetime.now()).isoformat(timespec="seconds")
+        stats = {"new": 0, "changed": 0, "unchanged": 0, "carried": 0, "windows": {}}
+        batch = {}
+        self.conn.execute("DELETE FROM run_uids")
+
+        # Jedna transakcia, riadky sa však zapisujú po dávkach a známe hashe aj UID tohto
+        # behu sa dopytujú len pre dávku – pamäť nerastie s veľkosťou úložiska ani prúdu.
+        with self.conn:
+            for ev in events:
+                ev = as_event(ev)
+                # Pri duplicitnom UID v jednom behu vyhráva prvý výskyt ako v exporte.
+                if ev.uid in batch:
+                    continue
+                batch[ev.uid] = ev
+                if len(batch) >= STORE_BATCH_SIZE:
+                    self._write_batch(batch, seen_at, stats)
+            self._write_batch(batch, seen_at, stats)
+        return stats
+
+    def _write_batch(self, batch, seen_at, stats):
+        if not batch:
+            return
+        marks = ",".join("?" * len(batch))
+        uids = list(batch)
+        done = {uid for (uid,) in self.conn.execute(f"SELECT uid FROM run_uids WHERE uid IN ({marks})", uids)}
+        known = dict(self.conn.execute(f"SELECT uid, content_hash FROM events WHERE uid IN ({marks})", uids))
+        windows = stats["windows"]
+        rows = []
+        for uid, ev in batch.items():
+            if uid in done:
                 continue
-            seen.add(key)
+            prev_hash = known.get(uid)
+            stats["new" if prev_hash is None else "changed" if prev_hash != ev.content_hash else "unchanged"] += 1
+            scraped = not isinstance(ev, CarriedEvent)
+            if scraped:
+                if ev.source not in windows or ev.start < windows[ev.source]:
+                    windows[ev.source] = ev.start
+            else:
+                stats["carried"] += 1
+            rows.append((
+                uid, ev.source, ev.summary, ev.location, ev.description, ev.url,
+                ev.start.isoformat(), ev.end.isoformat(), ev.content_hash, seen_at, seen_at, scraped,
+            ))
+        self.conn.executemany(_EVENT_STORE_UPSERT, rows)
+        self.conn.executemany("INSERT INTO run_uids (uid) VALUES (?)", ((r[0],) for r in rows))
+        batch.clear()
+
+    def prune(self, windows, days=STORE_PRUNE_DAYS, now=None):
+        # windows: zdroj -> začiatok okna, ktoré tento beh naozaj obnovil. Vymažú sa len
+        # záznamy v tomto okne, ktoré v behu neprišli ani neboli videné posledných `days` dní;
+        # starší archív mimo okna ostáva.
+        if days <= 0 or not windows:
+            return 0
+        before = ((now or datetime.now()) - timedelta(days=days)).isoformat(timespec="seconds")
+        removed = 0
+        with self.conn:
+            for source, start in windows.items():
+                removed += self.conn.execute(
+                    "DELETE FROM events WHERE source = ? AND start >= ? AND last_seen < ?"
+                    " AND uid NOT IN (SELECT uid FROM run_uids)",
+                    (source, start.isoformat(), before),
+                ).rowcount
+        return removed
+
+    def seed(self, pairs, seen_at=None):
+        # Naplní prázdne úložisko z posledného exportu (napr. po vyradení cache v CI);
+        # kľúčom je UID zo súboru, aby ho ďalší zber aktualizoval a nezdvojil.
+        seen_at = (seen_at or datetime.now()).isoformat(timespec="seconds")
+        with self.conn:
+            cur = self.conn.executemany(
+                "INSERT OR IGNORE INTO events (uid, source, summary, location, description, url, start,"
+                ' "end", content_hash, first_seen, last_seen) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (
+                    (uid, ev.source, ev.summary, ev.location, ev.description, ev.url,
+                     ev.start.isoformat(), ev.end.isoformat(), ev.content_hash, seen_at, seen_at)
+                    for uid, ev in pairs
+                ),
+            )
+        return cur.rowcount
 
-            full_desc = (desc + ("\n\n" + event_url if event_url else "\n\n" + url)).strip()
+    def iter_events(self):
+        # Poradie podľa prvého vloženia (rowid) – nové udalosti pribúdajú na koniec.
+        cur = self.conn.execute(
+            'SELECT summary, start, "end", source, location, description, url FROM events ORDER BY rowid'
+        )
+        for summary, start, end, source, location, description, url in cur:
+            yield Event(
+                summary=summary,
+                start=datetime.fromisoformat(start),
+                end=datetime.fromisoformat(end),
+                source=source,
+                location=location,
+                description=description,
+                url=url,
+            )
 
-            all_events.append({
-                "summary": title,
-                "location": location,
-                "description": full_desc,
-                "start": start_dt,
-                "end": end_dt,
-                "source": "ICKK",
-                "url": event_url or normalize_event_url(url),
-            })
-            page_added += 1
-            i += 1
+    def close(self):
+        self.conn.close()
 
-        print(f"[ICKK] stránka {idx}: {url}")
-        print(f"   -> pridané: {page_added}")
 
-    print(f"✅ ICKK spolu: {len(all_events)} podujatí")
-    return all_events
+_ICS_UNESCAPE_RE = re.compile(r"\\([\\;,nN])")
+
+
+def _ics_unescape(value):
+    return _ICS_UNESCAPE_RE.sub(lambda m: "\n" if m.group(1) in "nN" else m.group(1), value)
+
+
+def _ics_datetime(value, params):
+    if "VALUE=DATE" in params:
+        return datetime.strptime(value, "%Y%m%d")
+    dt = datetime.strptime(value, "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc)
+    return dt.astimezone(TZ).replace(tzinfo=None)
+
+
+def iter_ics_events(path):
+    # Spätné čítanie vlastného exportu: (UID zo súboru, Event). Celodenné udalosti
+    # sa vrátia s časom 00:00, DTEND;VALUE=DATE je exkluzívny.
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        text = f.read().replace("\r\n ", "").replace("\n ", "")
+    for m in _VEVENT_BLOCK_RE.finditer(text):
+        props = {}
+        for line in m.group(0).splitlines():
+            name, sep, value = line.partition(":")
+            if sep:
+                key, _, params = name.partition(";")
+                props[key.upper()] = (params.upper(), value)
+        try:
+            start = _ics_datetime(props["DTSTART"][1], props["DTSTART"][0])
+            if "DTEND" in props:
+                end = _ics_datetime(props["DTEND"][1], props["DTEND"][0])
+                if "VALUE=DATE" in props["DTEND"][0]:
+                    end -= timedelta(days=1)
+            else:
+                end = start
+            get = lambda k: _ics_unescape(props.get(k, ("", ""))[1])  # noqa: E731
+            yield props["UID"][1], Event(
+                summary=_PREFIX_RE.sub("", get("SUMMARY")),
+                start=start,
+                end=end,
+                source=get("CATEGORIES"),
+                location=get("LOCATION"),
+                description=get("DESCRIPTION"),
+                url=get("URL"),
+            )
+        except (KeyError, ValueError) as e:
+            print(f"⚠️ Nečitateľný VEVENT v {path}: {e}")
+
+
+def _past_cutoff(days):
+    if STORE_REFRESH_DAYS > 0 and EVENT_STORE_ENABLED and os.path.exists(EVENT_STORE_PATH):
+        days = min(days, STORE_REFRESH_DAYS)
+    return datetime.now() - timedelta(days=days)
 
 
 # =========================
@@ -876,131 +2312,989 @@ def _looks_fake_all_day(ev) -> bool:
     return same_time and likely_fake_hour and whole_days
 
 
-def _dedupe_key(ev):
-    url = normalize_event_url(ev.get("url", ""))
-    if url:
-        return ("url", url)
+_DTSTAMP_BASE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
 
-    base_title = _clean_event_title(ev["summary"])
-    if _is_all_day_00(ev) or _looks_fake_all_day(ev):
-        return (base_title, ev["start"].strftime("%Y-%m-%d"), ev["end"].strftime("%Y-%m-%d"))
-    return (base_title, ev["start"].strftime("%Y-%m-%d %H:%M"), ev["end"].strftime("%Y-%m-%d %H:%M"))
+def _dedupe_key(ev):
+    return as_event(ev).dedupe_key
 
 
 def _stable_uid(ev):
-    url = normalize_event_url(ev.get("url", ""))
-    if url:
-        base = f"url|{url}"
-    else:
-        title = _clean_event_title(ev["summary"])
-        start_part = ev["start"].strftime("%Y-%m-%d %H:%M")
-        end_part = ev["end"].strftime("%Y-%m-%d %H:%M")
-        kind = "ALLDAY" if (_is_all_day_00(ev) or _looks_fake_all_day(ev)) else "TIMED"
-        base = f"{title}|{start_part}|{end_part}|{kind}"
-    return hashlib.sha1(base.encode("utf-8")).hexdigest() + "@cike-events"
+    return as_event(ev).uid
 
 
 def _stable_dtstamp(ev):
-    url = normalize_event_url(ev.get("url", ""))
-    if url:
-        base = f"dtstamp|{url}"
-    else:
-        title = _clean_event_title(ev["summary"])
-        start_part = ev["start"].strftime("%Y-%m-%d %H:%M")
-        end_part = ev["end"].strftime("%Y-%m-%d %H:%M")
-        kind = "ALLDAY" if (_is_all_day_00(ev) or _looks_fake_all_day(ev)) else "TIMED"
-        base = f"dtstamp|{title}|{start_part}|{end_part}|{kind}"
+    return as_event(ev).dtstamp
+
+
+# =========================
+# Fuzzy dedupe naprieč zdrojmi
+# =========================
 
-    digest = hashlib.sha1(base.encode("utf-8")).hexdigest()
-    seed = int(digest[:8], 16)
-    base_dt = datetime(2025, 1, 1, tzinfo=timezone.utc)
-    offset_seconds = seed % (3600 * 24 * 365)
-    return base_dt + timedelta(seconds=offset_seconds)
+FUZZY_DEDUPE = os.environ.get("CIKE_FUZZY_DEDUPE", "1") != "0"
+FUZZY_TITLE_THRESHOLD = 0.85
+FUZZY_DATE_WINDOW_DAYS = 1
+FUZZY_CROSS_SOURCE_ONLY = True
+FUZZY_SHINGLE = 3
+FUZZY_MINHASH_BANDS = 12
+FUZZY_MINHASH_ROWS = 2
+# Pri zhode vyhráva zdroj, ktorý je v zozname skôr.
+FUZZY_SOURCE_PRIORITY = ("SOPK", "ICKK", "ITVALLEY", "AMCHAM", "OTHER")
+
+_MINHASH_PRIME = (1 << 61) - 1
+_MINHASH_PARAMS = [
+    (1 + (i * 0x9E3779B97F4A7C15) % (_MINHASH_PRIME - 1), (i * 0xC2B2AE3D27D4EB4F) % _MINHASH_PRIME)
+    for i in range(1, FUZZY_MINHASH_BANDS * FUZZY_MINHASH_ROWS + 1)
+]
+
+
+def _fuzzy_title(ev) -> str:
+    t = unicodedata.normalize("NFKD", ev.clean_title)
+    t = "".join(ch for ch in t if not unicodedata.combining(ch))
+    return " ".join(re.sub(r"[^\w]+", " ", t).split())
+
+
+def _minhash_signature(title) -> str:
+    # Každé pásmo sa zloží do 64-bitového kľúča; podpis je ich hex reťazec,
+    # aby sa dal uložiť v indexe exportu a pri ďalšom behu znovu použiť.
+    padded = f" {title} "
+    shingles = {padded[i:i + FUZZY_SHINGLE] for i in range(max(1, len(padded) - FUZZY_SHINGLE + 1))}
+    codes = [zlib.crc32(sh.encode("utf-8")) for sh in shingles]
+    sig = [min((a * c + b) % _MINHASH_PRIME for c in codes) for a, b in _MINHASH_PARAMS]
+    keys = []
+    for band in range(FUZZY_MINHASH_BANDS):
+        key = 0
+        for value in sig[band * FUZZY_MINHASH_ROWS:(band + 1) * FUZZY_MINHASH_ROWS]:
+            key = (key * 0x100000001B3 ^ value) & 0xFFFFFFFFFFFFFFFF
+        keys.append(f"{key:016x}")
+    return "".join(keys)
+
+
+def _minhash_bands(signature):
+    return [(band, signature[band * 16:(band + 1) * 16]) for band in range(FUZZY_MINHASH_BANDS)]
+
+
+def _title_similarity(a: str, b: str) -> float:
+    ta, tb = set(a.split()), set(b.split())
+    jaccard = len(ta & tb) / len(ta | tb) if ta and tb else 0.0
+    if jaccard >= FUZZY_TITLE_THRESHOLD:
+        return jaccard
+    return max(jaccard, SequenceMatcher(None, a, b).ratio())
+
+
+def _fuzzy_rank(ev):
+    try:
+        prio = FUZZY_SOURCE_PRIORITY.index(ev.src)
+    except ValueError:
+        prio = len(FUZZY_SOURCE_PRIORITY)
+    return (prio, -len(ev.description), ev.uid)
+
+
+def fuzzy_dedupe(events, dropped=None, signatures=None):
+    # Blokovanie: kandidáti sú len udalosti s rovnakým MinHash pásmom názvu
+    # v okne ±FUZZY_DATE_WINDOW_DAYS; detailné porovnanie beží len v rámci bloku.
+    # signatures: uid -> (content_hash, podpis) z minulého exportu; platné záznamy sa použijú
+    # a po návrate slovník obsahuje podpisy práve spracovaných udalostí.
+    events = list(events)
+    buckets = {}
+    parent = list(range(len(events)))
+    sources = [{ev.src} for ev in events]
+    signatures = {} if signatures is None else signatures
+    previous = dict(signatures)
+    signatures.clear()
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    titles = [_fuzzy_title(ev) for ev in events]
+    for i, ev in enumerate(events):
+        if not titles[i]:
+            continue
+        day = ev.start.toordinal()
+        cached = previous.get(ev.uid)
+        if cached and cached[0] == ev.content_hash:
+            signature = cached[1]
+        else:
+            signature = _minhash_signature(titles[i])
+        signatures[ev.uid] = (ev.content_hash, signature)
+        bands = _minhash_bands(signature)
+
+        candidates = set()
+        for d in range(day - FUZZY_DATE_WINDOW_DAYS, day + FUZZY_DATE_WINDOW_DAYS + 1):
+            for band in bands:
+                candidates.update(buckets.get((d, band), ()))
+
+        for j in sorted(candidates):
+            ri, rj = find(i), find(j)
+            if ri == rj:
+                continue
+            # Zhlukovanie by inak reťazilo: A~B a B~C zlúči aj A a C z toho istého zdroja.
+            if FUZZY_CROSS_SOURCE_ONLY and sources[ri] & sources[rj]:
+                continue
+            if _title_similarity(titles[i], titles[j]) >= FUZZY_TITLE_THRESHOLD:
+                parent[ri] = rj
+                sources[rj] |= sources[ri]
+
+        for band in bands:
+            buckets.setdefault((day, band), []).append(i)
 
+    clusters = {}
+    for i in range(len(events)):
+        clusters.setdefault(find(i), []).append(i)
 
-def export_events_to_ics(events, filename="events.ics"):
-    seen, unique = set(), []
+    keep = set()
+    for members in clusters.values():
+        keep.add(min(members, key=lambda i: _fuzzy_rank(events[i])))
+
+    out = []
+    for i, ev in enumerate(events):
+        if i in keep:
+            out.append(ev)
+        elif dropped is not None:
+            dropped[ev.src] = dropped.get(ev.src, 0) + 1
+    return out
+
+
+ICS_HEADER = [
+    "BEGIN:VCALENDAR",
+    "VERSION:2.0",
+    "PRODID:-//CIKE//Events Calendar//EN",
+    "CALSCALE:GREGORIAN",
+    "METHOD:PUBLISH",
+    "X-WR-CALNAME:CIKE Events",
+    "X-WR-TIMEZONE:Europe/Bratislava",
+]
+ICS_FOOTER = ["END:VCALENDAR"]
+
+
+def iter_unique_events(events, dropped=None):
+    seen = set()
     for ev in events:
-        k = _dedupe_key(ev)
+        ev = as_event(ev)
+        k = ev.dedupe_key
         if k not in seen:
             seen.add(k)
-            unique.append(ev)
-
-    lines = [
-        "BEGIN:VCALENDAR",
-        "VERSION:2.0",
-        "PRODID:-//CIKE//Events Calendar//EN",
-        "CALSCALE:GREGORIAN",
-        "METHOD:PUBLISH",
-        "X-WR-CALNAME:CIKE Events",
-        "X-WR-TIMEZONE:Europe/Bratislava",
-    ]
+            yield ev
+        elif dropped is not None:
+            dropped[ev.src] = dropped.get(ev.src, 0) + 1
+
+
+def iter_vevent_lines(ev):
+    ev = as_event(ev)
+    src = ev.src
+    summary = _with_emoji_prefix(ev.summary, src)
+    location = ev.location
+    description = ev.description
+    event_url = ev.norm_url
+    uid = ev.uid
+    dtstamp = ev.dtstamp
+
+    s = ev.start
+    t = ev.end
+
+    yield "BEGIN:VEVENT"
+    yield f"UID:{uid}"
+    yield f"DTSTAMP:{format_utc_dt(dtstamp)}"
+    yield f"CATEGORIES:{ics_escape(src)}"
+    yield f"SUMMARY:{ics_escape(summary)}"
+
+    if location:
+        yield f"LOCATION:{ics_escape(location)}"
+    if description:
+        yield f"DESCRIPTION:{ics_escape(description)}"
+    if event_url:
+        yield f"URL:{ics_escape(event_url)}"
+
+    if ev.all_day:
+        start_date = s.date()
+        end_date = t.date()
+
+        yield f"DTSTART;VALUE=DATE:{format_date_only(start_date)}"
+
+        if end_date > start_date:
+            dtend_exclusive = end_date + timedelta(days=1)
+            yield f"DTEND;VALUE=DATE:{format_date_only(dtend_exclusive)}"
+    else:
+        yield f"DTSTART:{format_utc_dt(s)}"
+        yield f"DTEND:{format_utc_dt(t)}"
+
+    yield "END:VEVENT"
+
+
+def iter_ics_lines(events):
+    yield from ICS_HEADER
+    for ev in events:
+        yield from iter_vevent_lines(ev)
+    yield from ICS_FOOTER
+
+
+# Zvýšiť pri každej zmene formátu VEVENT, aby sa staré bloky nepoužili.
+ICS_FORMAT_VERSION = 1
+EXPORT_INDEX_DIR = os.path.join(STATE_DIR, "export")
+
+_VEVENT_BLOCK_RE = re.compile(r"BEGIN:VEVENT\r\nUID:([^\r]*)\r\n.*?END:VEVENT\r\n", re.S)
+
+
+def _export_index_path(filename):
+    return os.path.join(EXPORT_INDEX_DIR, os.path.basename(filename) + ".json")
+
+
+def _read_previous_export(filename):
+    try:
+        with open(filename, "r", encoding="utf-8", newline="") as f:
+            text = f.read()
+    except OSError:
+        return None, {}
+    sha = hashlib.sha1(text.encode("utf-8")).hexdigest()
+    return sha, {m.group(1): m.group(0) for m in _VEVENT_BLOCK_RE.finditer(text)}
+
+
+def _load_export_index(filename, file_sha):
+    # Vráti (uid -> content_hash, uid -> [content_hash, MinHash podpis]) z indexu minulého exportu.
+    try:
+        with open(_export_index_path(filename), "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}, {}
+    if index.get("version") != ICS_FORMAT_VERSION or index.get("sha1") != file_sha:
+        return {}, {}
+    return index.get("events", {}), index.get("minhash", {})
+
+
+def _save_export_index(filename, file_sha, hashes, minhash=None):
+    path = _export_index_path(filename)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"version": ICS_FORMAT_VERSION, "sha1": file_sha, "events": hashes, "minhash": minhash or {}}, f)
+        os.replace(path + ".tmp", path)
+    except OSError as e:
+        print(f"⚠️ Index exportu sa nepodarilo uložiť: {e}")
+
 
-    for ev in unique:
-        src = normalize_source(ev.get("source", "OTHER"))
-        summary = _with_emoji_prefix(ev["summary"], src)
-        location = ev.get("location", "")
-        description = ev.get("description", "")
-        event_url = normalize_event_url(ev.get("url", ""))
-        uid = _stable_uid(ev)
-        dtstamp = _stable_dtstamp(ev)
-
-        s = ev["start"]
-        t = ev["end"]
-
-        lines.append("BEGIN:VEVENT")
-        lines.append(f"UID:{uid}")
-        lines.append(f"DTSTAMP:{format_utc_dt(dtstamp)}")
-        lines.append(f"CATEGORIES:{ics_escape(src)}")
-        lines.append(f"SUMMARY:{ics_escape(summary)}")
-
-        if location:
-            lines.append(f"LOCATION:{ics_escape(location)}")
-        if description:
-            lines.append(f"DESCRIPTION:{ics_escape(description)}")
-        if event_url:
-            lines.append(f"URL:{ics_escape(event_url)}")
-
-        if _is_all_day_00(ev) or _looks_fake_all_day(ev):
-            start_date = s.date()
-            end_date = t.date()
-
-            lines.append(f"DTSTART;VALUE=DATE:{format_date_only(start_date)}")
-
-            if end_date > start_date:
-                dtend_exclusive = end_date + timedelta(days=1)
-                lines.append(f"DTEND;VALUE=DATE:{format_date_only(dtend_exclusive)}")
+EXPORT_SHARDS = os.environ.get("CIKE_SHARDS", "1") != "0"
+SHARDS_DIRNAME = "feeds"
+
+
+def _file_sha1(filename):
+    try:
+        with open(filename, "rb") as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+class _FeedWriter:
+    # Streamuje jeden ICS súbor do dočasného súboru a priebežne ho hashuje;
+    # pri rovnakom SHA-1 dočasný súbor zmaže a pôvodný nechá nedotknutý.
+
+    def __init__(self, filename, calname=None, prev_sha=None):
+        self.filename = filename
+        self.prev_sha = prev_sha if prev_sha is not None else _file_sha1(filename)
+        self.digest = hashlib.sha1()
+        self.count = 0
+        self.bytes = 0
+        self.changed = False
+        directory = os.path.dirname(os.path.abspath(filename))
+        os.makedirs(directory, exist_ok=True)
+        fd, self.tmp = tempfile.mkstemp(prefix=".ics-", suffix=".tmp", dir=directory)
+        self.f = os.fdopen(fd, "w", encoding="utf-8", newline="", buffering=1 << 16)
+
+        header = ICS_HEADER if calname is None else [
+            f"X-WR-CALNAME:{calname}" if line.startswith("X-WR-CALNAME:") else line for line in ICS_HEADER
+        ]
+        self._write("".join(fold_ical_line(line) + "\r\n" for line in header))
+
+    def _write(self, chunk):
+        data = chunk.encode("utf-8")
+        self.f.write(chunk)
+        self.digest.update(data)
+        self.bytes += len(data)
+
+    def add(self, block):
+        self._write(block)
+        self.count += 1
+
+    def close(self):
+        self._write("".join(fold_ical_line(line) + "\r\n" for line in ICS_FOOTER))
+        self.f.close()
+        self.sha1 = self.digest.hexdigest()
+        self.changed = self.sha1 != self.prev_sha
+        if self.changed:
+            os.chmod(self.tmp, 0o644)
+            os.replace(self.tmp, self.filename)
         else:
-            lines.append(f"DTSTART:{format_utc_dt(s)}")
-            lines.append(f"DTEND:{format_utc_dt(t)}")
+            os.remove(self.tmp)
 
-        lines.append("END:VEVENT")
+    def abort(self):
+        self.f.close()
+        try:
+            os.remove(self.tmp)
+        except OSError:
+            pass
 
-    lines.append("END:VCALENDAR")
 
-    folded = [fold_ical_line(line) for line in lines]
-    with open(filename, "w", encoding="utf-8", newline="") as f:
-        f.write("\r\n".join(folded) + "\r\n")
+def _shard_keys(ev, today):
+    yield f"events-{ev.src.lower()}.ics", "source", ev.src
+    yield f"events-{ev.start.year}.ics", "year", str(ev.start.year)
+    if ev.end.date() >= today:
+        yield "events-upcoming.ics", "upcoming", "upcoming"
 
-    print(f"✅ ICS '{filename}' vytvorený – {len(unique)} udalostí (po dedupe).")
+
+def _write_manifest(shards_dir, feeds):
+    path = os.path.join(shards_dir, "manifest.json")
+    text = json.dumps({"feeds": feeds}, indent=2, ensure_ascii=False) + "\n"
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            if f.read() == text:
+                return
+    except OSError:
+        pass
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(path + ".tmp", path)
+
+
+def _remove_stale_shards(shards_dir, produced):
+    for name in os.listdir(shards_dir):
+        if name.startswith("events-") and name.endswith(".ics") and name not in produced:
+            os.remove(os.path.join(shards_dir, name))
+
+
+def export_events_to_ics(events, filename="events.ics", shards=None):
+    t_start = time.perf_counter()
+    shards = EXPORT_SHARDS if shards is None else shards
+    if isinstance(events, EventStore):
+        events = events.iter_events()
+    prev_sha, prev_blocks = _read_previous_export(filename)
+    prev_hashes, prev_minhash = _load_export_index(filename, prev_sha) if prev_blocks else ({}, {})
+    load_ms = _elapsed_ms(t_start)
+    dropped = {}
+    fuzzy_dropped = {}
+    signatures = {uid: tuple(entry) for uid, entry in prev_minhash.items()}
+
+    unique = iter_unique_events(events, dropped)
+    if FUZZY_DEDUPE:
+        unique = fuzzy_dedupe(unique, fuzzy_dropped, signatures)
+        if fuzzy_dropped:
+            print(f"🔗 Fuzzy dedupe: zlúčených {sum(fuzzy_dropped.values())} udalostí {fuzzy_dropped}")
+
+    hashes = {}
+    reused = 0
+    shards_dir = os.path.join(os.path.dirname(filename), SHARDS_DIRNAME)
+    today = datetime.now().date()
+
+    main = _FeedWriter(filename, prev_sha=prev_sha)
+    shard_writers = {}
+    try:
+        # Jeden prechod: každý VEVENT blok sa serializuje raz a zapíše do všetkých feedov.
+        for ev in unique:
+            uid = ev.uid
+            content_hash = ev.content_hash
+            hashes[uid] = content_hash
+
+            block = prev_blocks.get(uid) if prev_hashes.get(uid) == content_hash else None
+            if block is None:
+                block = "".join(fold_ical_line(line) + "\r\n" for line in iter_vevent_lines(ev))
+            else:
+                reused += 1
+            main.add(block)
+
+            if shards:
+                for name, kind, key in _shard_keys(ev, today):
+                    writer = shard_writers.get(name)
+                    if writer is None:
+                        label = "nadchádzajúce" if kind == "upcoming" else key
+                        writer = _FeedWriter(os.path.join(shards_dir, name), calname=f"CIKE Events – {label}")
+                        writer.kind, writer.key = kind, key
+                        shard_writers[name] = writer
+                    writer.add(block)
+
+        main.close()
+        for writer in shard_writers.values():
+            writer.close()
+    except BaseException:
+        for writer in [main] + list(shard_writers.values()):
+            writer.abort()
+        raise
+
+    count = main.count
+    if main.changed:
+        print(f"✅ ICS '{filename}' vytvorený – {count} udalostí (po dedupe).")
+    else:
+        print(f"✅ ICS '{filename}' bez zmeny – {count} udalostí (po dedupe), súbor ponechaný.")
+    print(f"   ♻️ znovupoužité bloky: {reused}, serializované: {count - reused}")
+
+    if shards:
+        # Bez udalostí sa žiadny shard neotvorí – priečinok treba pre manifest aj tak.
+        os.makedirs(shards_dir, exist_ok=True)
+        _remove_stale_shards(shards_dir, shard_writers)
+        _write_manifest(shards_dir, [
+            {"file": name, "kind": w.kind, "key": w.key, "events": w.count, "bytes": w.bytes, "sha1": w.sha1}
+            for name, w in sorted(shard_writers.items())
+        ])
+        changed = sum(1 for w in shard_writers.values() if w.changed)
+        print(f"   🗂️ feedy v '{shards_dir}': {len(shard_writers)} (zmenených {changed})")
+
+    _save_export_index(filename, main.sha1, hashes, signatures if FUZZY_DEDUPE else None)
+    if METRICS:
+        METRICS.export_step(
+            file=filename,
+            events=count,
+            reused=reused,
+            serialized=count - reused,
+            dedupe_dropped=dropped,
+            fuzzy_dropped=fuzzy_dropped,
+            bytes=main.bytes,
+            changed=main.changed,
+            shards={name: w.count for name, w in shard_writers.items()},
+            load_ms=load_ms,
+            total_ms=_elapsed_ms(t_start),
+        )
     return filename
 
 
+# =========================
+# Plánovač obnovy zdrojov
+# =========================
+
+SCHEDULE_ENABLED = os.environ.get("CIKE_SCHEDULE", "1") != "0"
+SCHEDULE_PATH = os.path.join(STATE_DIR, "schedule.json")
+DAY = 24 * 3600
+
+
+def _amcham_probe():
+    # Lacná sonda: iba statická stránka a hash kontajnera nadchádzajúcich podujatí.
+    r = http_get(AMCHAM_URL)
+    if not r:
+        return None
+    cont = make_soup(r.text).select_one(AMCHAM_UPCOMING_CSS)
+    if cont is None:
+        return None
+    return hashlib.sha1(clean_text(cont.get_text(" ", strip=True)).encode("utf-8")).hexdigest()
+
+
+# every: maximálny vek posledného dobrého výsledku v sekundách (0 = každý beh)
+# probe: lacná kontrola zmeny; ak sa jej hash zmení, úloha sa spustí hneď
+REFRESH_POLICIES = {
+    "ITVALLEY": {"every": 0},
+    "AMCHAM": {"every": 7 * DAY, "probe": _amcham_probe},
+    "SOPK-future": {"every": 0},
+    "SOPK-past": {"every": 7 * DAY},
+    "ICKK-upcoming": {"every": 0},
+    "ICKK-past": {"every": 7 * DAY},
+}
+
+
+class RefreshScheduler:
+    def __init__(self, path=SCHEDULE_PATH, policies=None, force=()):
+        self.path = path
+        self.policies = policies if policies is not None else REFRESH_POLICIES
+        self.force = {f.upper() for f in force}
+        self.state = _load_json_state(path)
+        self.lock = threading.Lock()
+
+    def forced(self, job):
+        job = job.upper()
+        return "ALL" in self.force or job in self.force or job.split("-")[0] in self.force
+
+    def due(self, job, entry, probe):
+        if self.forced(job) or not entry or not entry.get("events"):
+            return True
+        policy = self.policies.get(job, {})
+        every = policy.get("every", 0)
+        if every <= 0 or time.time() - entry.get("at", 0) >= every:
+            return True
+        if "probe" in policy:
+            return probe is None or probe != entry.get("probe")
+        return False
+
+    def iter(self, job, fn):
+        # fn vracia iterovateľný zdroj udalostí; výsledok sa posiela ďalej priebežne
+        # a do stavu sa uloží až po úplnom dobehnutí úlohy.
+        policy = self.policies.get(job, {})
+        with self.lock:
+            entry = self.state.get(job)
+
+        probe = None
+        if policy.get("probe") and entry and not self.forced(job):
+            try:
+                probe = policy["probe"]()
+            except Exception as e:
+                print(f"⚠️ {job}: sonda zlyhala: {e}")
+
+        if not self.due(job, entry, probe):
+            age = (time.time() - entry["at"]) / 3600
+            print(f"⏭️ {job}: bez zmeny, použijem posledný výsledok ({age:.0f} h)")
+            yield from (_event_from_json(d) for d in entry["events"])
+            return
+
+        stored = []
+        for ev in fn() or ():
+            stored.append(_event_to_json(ev))
+            yield ev
+        if not stored:
+            if entry and entry.get("events"):
+                print(f"⚠️ {job}: prázdny výsledok – použijem posledný dobrý")
+                yield from (_event_from_json(d) for d in entry["events"])
+            return
+
+        if policy.get("probe") and probe is None:
+            try:
+                probe = policy["probe"]()
+            except Exception:
+                probe = None
+        with self.lock:
+            self.state[job] = {"at": time.time(), "probe": probe, "events": stored}
+
+    def save(self):
+        with self.lock:
+            _save_json_state(self.path, self.state)
+
+
+SCHEDULER = None
+
+
+def refresh_forced(job):
+    return SCHEDULER is not None and SCHEDULER.forced(job)
+
+
+def scheduled_iter(job, fn):
+    if SCHEDULER is None:
+        return iter(fn() or ())
+    return SCHEDULER.iter(job, fn)
+
+
+# =========================
+# Orchestrácia zdrojov
+# =========================
+
+DEFAULT_SOURCE_TIMEOUT = 300
+SOURCE_TIMEOUTS = {
+    "ITVALLEY": 300,
+    "AMCHAM": 420,
+    "SOPK": 300,
+    "ICKK": 300,
+}
+
+SCRAPERS = [
+    ("ITVALLEY", iter_itvalley_events),
+    ("AMCHAM", scrape_amcham_events),
+    ("SOPK", iter_sopk_events),
+    ("ICKK", iter_ickk_events),
+]
+
+# Prúdi len úsek zber -> úložisko: fronta drží najviac SOURCE_QUEUE_SIZE udalostí
+# na zdroj a EventStore.upsert zapisuje po dávkach. Zvyšok behu nie je ohraničený
+# stránkou: plánovač a PaginationController držia JSON všetkých udalostí svojej úlohy,
+# AmCham vracia celý zoznam naraz, export začne až po dobehnutí všetkých zdrojov
+# a fuzzy_dedupe (aj obohatenie pri CIKE_ENRICH) zhromaždí všetky udalosti.
+SOURCE_QUEUE_SIZE = 256
+_SOURCE_DONE = object()
+
+
+class _SourceFeed:
+    # Daemon vlákno plní ohraničenú frontu; keď je plná, zdroj čaká (spätný tlak)
+    # a tento čas sa nepočíta do jeho časového limitu.
+    def __init__(self, name, fn, maxsize=SOURCE_QUEUE_SIZE):
+        self.name = name
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.stop = threading.Event()
+        self.blocked = 0.0
+        self.started = time.monotonic()
+        self.finished = None
+        threading.Thread(target=self._run, args=(fn,), name=f"scraper-{name}", daemon=True).start()
+
+    def _put(self, item):
+        t0 = time.monotonic()
+        try:
+            while not self.stop.is_set():
+                try:
+                    self.queue.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        finally:
+            self.blocked += time.monotonic() - t0
+
+    def elapsed(self):
+        # Vlastný čas zdroja (do vyčerpania alebo chyby), nie čas, keď ho dočerpal spotrebiteľ.
+        return (self.finished or time.monotonic()) - self.started
+
+    def _run(self, fn):
+        try:
+            for ev in fn() or ():
+                if not self._put(ev):
+                    return
+            self.finished = time.monotonic()
+            self._put(_SOURCE_DONE)
+        except BaseException as e:
+            self.finished = time.monotonic()
+            self._put(e)
+
+
+def iter_scraped_events(scrapers=None, timeouts=None, counts=None, statuses=None):
+    # Zdroje bežia súbežne, udalosti sa však vydávajú v pevnom poradí zdrojov
+    # => deterministický výstup; zápis do úložiska môže začať skôr, než dobehne najpomalší zdroj.
+    scrapers = scrapers if scrapers is not None else SCRAPERS
+    timeouts = timeouts if timeouts is not None else SOURCE_TIMEOUTS
+    counts = {} if counts is None else counts
+    statuses = {} if statuses is None else statuses
+
+    started = time.monotonic()
+    feeds = [
+        _SourceFeed(name, (lambda n=name, f=fn: scheduled_iter(n, f)) if name in REFRESH_POLICIES else fn)
+        for name, fn in scrapers
+    ]
+    try:
+        for feed in feeds:
+            name = feed.name
+            limit = timeouts.get(name, DEFAULT_SOURCE_TIMEOUT)
+            counts[name] = 0
+            status = "ok"
+            while True:
+                remaining = limit + feed.blocked - (time.monotonic() - started)
+                try:
+                    item = feed.queue.get(timeout=min(max(remaining, 0.0), 0.5))
+                except queue.Empty:
+                    if remaining > 0:
+                        continue
+                    print(f"⚠️ {name}: prekročený limit {limit}s – pokračujem bez zvyšku tohto zdroja")
+                    status = "timeout"
+                    break
+                if item is _SOURCE_DONE:
+                    print(f"⏱️ {name}: {counts[name]} podujatí za {feed.elapsed():.1f}s")
+                    break
+                if isinstance(item, BaseException):
+                    print(f"⚠️ {name}: zlyhanie zdroja: {item}")
+                    status = f"error: {item}"
+                    break
+                counts[name] += 1
+                yield item
+            feed.stop.set()
+            statuses[name] = status
+            if METRICS:
+                METRICS.source(name, status=status, events=counts[name],
+                               seconds=round(feed.elapsed(), 2), blocked_seconds=round(feed.blocked, 2))
+    finally:
+        for feed in feeds:
+            feed.stop.set()
+
+
+# =========================
+# Webcal server
+# =========================
+# Feed sa drží v pamäti ako zoznam hotových VEVENT blokov s indexom podľa zdroja
+# a dátumu; každá odpoveď (aj filtrovaná) sa vyrába raz, komprimuje vopred a
+# ďalej sa už len posiela, alebo sa vráti 304 podľa ETagu.
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+SERVE_MAX_AGE = 300
+SERVE_CACHE_SIZE = 64
+SERVE_RELOAD_CHECK = 1.0   # ako často (s) sa kontroluje zmena súboru
+
+_SERVE_BLOCK_RE = re.compile(rb"BEGIN:VEVENT\r\n.*?END:VEVENT\r\n", re.S)
+_SERVE_CATEGORY_RE = re.compile(rb"\r\nCATEGORIES:([^\r]*)")
+_SERVE_DATE_RE = {
+    name: re.compile(rb"\r\n" + name + rb"(;VALUE=DATE)?:(\d{8})(T\d{6}Z)?")
+    for name in (b"DTSTART", b"DTEND")
+}
+
+
+def _ics_local_date(m):
+    if m.group(3):
+        dt = datetime.strptime((m.group(2) + m.group(3)).decode(), "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc)
+        return dt.astimezone(TZ).date()
+    return datetime.strptime(m.group(2).decode(), "%Y%m%d").date()
+
+
+class _Rendition:
+    def __init__(self, body, mtime):
+        self.etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        self.last_modified = time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(mtime))
+        self.bodies = {"identity": body, "gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            self.bodies["br"] = brotli.compress(body)
+
+    def etag_for(self, encoding):
+        return self.etag if encoding == "identity" else self.etag[:-1] + "-" + encoding + '"'
+
+
+class FeedIndex:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.checked = 0.0
+        self.signature = None
+        self.cache = collections.OrderedDict()
+        self._load()
+
+    def _load(self):
+        st = os.stat(self.path)
+        with open(self.path, "rb") as f:
+            data = f.read()
+
+        blocks = list(_SERVE_BLOCK_RE.finditer(data))
+        self.head = data[:blocks[0].start()] if blocks else data.replace(b"END:VCALENDAR\r\n", b"")
+        self.tail = data[blocks[-1].end():] if blocks else b"END:VCALENDAR\r\n"
+        self.blocks = [m.group(0) for m in blocks]
+
+        # (začiatok, koniec vrátane, poradie) podľa zdroja, zoradené podľa začiatku
+        self.by_source = {}
+        for idx, block in enumerate(self.blocks):
+            cat = _SERVE_CATEGORY_RE.search(block)
+            start = _SERVE_DATE_RE[b"DTSTART"].search(block)
+            if not start:
+                continue
+            start_day = _ics_local_date(start).toordinal()
+            end = _SERVE_DATE_RE[b"DTEND"].search(block)
+            end_day = start_day
+            if end:
+                end_day = _ics_local_date(end).toordinal() - (1 if end.group(1) else 0)
+            src = cat.group(1).decode("utf-8").upper() if cat else "OTHER"
+            self.by_source.setdefault(src, []).append((start_day, max(end_day, start_day), idx))
+        for rows in self.by_source.values():
+            rows.sort()
+        self.max_span = max((e - s for rows in self.by_source.values() for s, e, _ in rows), default=0)
+
+        self.mtime = st.st_mtime
+        self.signature = (st.st_mtime_ns, st.st_size)
+        self.cache.clear()
+        self.full = _Rendition(data, self.mtime)
+        print(f"📡 Feed '{self.path}': {len(self.blocks)} udalostí, zdroje {sorted(self.by_source)}")
+
+    def refresh(self):
+        now = time.monotonic()
+        with self.lock:
+            if now - self.checked < SERVE_RELOAD_CHECK:
+                return
+            self.checked = now
+            try:
+                st = os.stat(self.path)
+            except OSError:
+                return
+            if (st.st_mtime_ns, st.st_size) != self.signature:
+                self._load()
+
+    def select(self, sources, date_from, date_to):
+        lo = date_from.toordinal() if date_from else None
+        hi = date_to.toordinal() if date_to else None
+        picked = []
+        for src in sources or self.by_source:
+            rows = self.by_source.get(src, [])
+            # začiatok <= to (bisect) a koniec >= from; dlhšie podujatia pokryje max_span
+            first = 0 if lo is None else bisect.bisect_left(rows, (lo - self.max_span,))
+            last = len(rows) if hi is None else bisect.bisect_right(rows, (hi, float("inf")))
+            picked.extend(idx for s, e, idx in rows[first:last] if lo is None or e >= lo)
+        picked.sort()   # pôvodné poradie feedu
+        return picked
+
+    def rendition(self, sources, date_from, date_to):
+        if not sources and not date_from and not date_to:
+            return self.full
+        key = (tuple(sorted(sources)), date_from, date_to)
+        with self.lock:
+            hit = self.cache.get(key)
+            if hit is not None:
+                self.cache.move_to_end(key)
+                return hit
+            body = self.head + b"".join(self.blocks[i] for i in self.select(sources, date_from, date_to)) + self.tail
+            rendition = _Rendition(body, self.mtime)
+            self.cache[key] = rendition
+            while len(self.cache) > SERVE_CACHE_SIZE:
+                self.cache.popitem(last=False)
+            return rendition
+
+
+def _parse_feed_query(query):
+    params = parse_qs(query)
+    sources = {normalize_source(x) for v in params.get("source", []) for x in v.split(",") if x.strip()}
+    dates = []
+    for name in ("from", "to"):
+        value = (params.get(name) or [""])[-1]
+        dates.append(datetime.strptime(value, "%Y-%m-%d").date() if value else None)
+    return sources, dates[0], dates[1]
+
+
+def _pick_encoding(accept, available):
+    # Najvyššie q vyhráva, pri zhode br pred gzip; q=0 kódovanie výslovne odmieta.
+    accepted = {}
+    for part in (accept or "").split(","):
+        name, *params = [p.strip() for p in part.split(";")]
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name:
+            accepted[name.lower()] = q
+    best = max(("br", "gzip"), key=lambda enc: accepted.get(enc, 0.0) if enc in available else 0.0)
+    return best if best in available and accepted.get(best, 0.0) > 0 else "identity"
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    feed = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def do_HEAD(self):
+        self.do_GET(head=True)
+
+    def do_GET(self, head=False):
+        path, _, query = self.path.partition("?")
+        if path not in ("/", "/events.ics"):
+            return self._plain(404, "not found")
+        try:
+            sources, date_from, date_to = _parse_feed_query(query)
+        except ValueError:
+            return self._plain(400, "from/to musia byť v tvare YYYY-MM-DD")
+
+        self.feed.refresh()
+        rendition = self.feed.rendition(sources, date_from, date_to)
+        encoding = _pick_encoding(self.headers.get("Accept-Encoding"), rendition.bodies)
+        etag = rendition.etag_for(encoding)
+
+        inm = self.headers.get("If-None-Match", "")
+        tags = {t.strip().removeprefix("W/") for t in inm.split(",")}
+        status = 304 if inm.strip() == "*" or etag in tags or rendition.etag in tags else 200
+        body = rendition.bodies[encoding]
+
+        self.send_response(status)
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", rendition.last_modified)
+        self.send_header("Cache-Control", f"public, max-age={SERVE_MAX_AGE}")
+        self.send_header("Vary", "Accept-Encoding")
+        if status == 304:
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_header("Content-Type", "text/calendar; charset=utf-8")
+        if encoding != "identity":
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def _plain(self, status, text):
+        body = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+
+def serve_feed(path="events.ics", host="0.0.0.0", port=8080):
+    handler = type("BoundFeedHandler", (FeedHandler,), {"feed": FeedIndex(path)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    print(f"📡 Webcal server na http://{host}:{port}/events.ics (?source=&from=&to=)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
 # =========================
 # Main
 # =========================
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Zber podujatí z košických webov do events.ics")
+    parser.add_argument(
+        "--force", action="append", default=[], metavar="SOURCE",
+        help="obnov zdroj bez ohľadu na plán (ITVALLEY, AMCHAM, SOPK, ICKK, SOPK-past, …, alebo all)",
+    )
+    parser.add_argument("--serve", type=int, metavar="PORT", help="neskenuj, len podávaj feed cez HTTP (webcal)")
+    parser.add_argument("--host", default="0.0.0.0", help="adresa pre --serve")
+    parser.add_argument("--feed", default="events.ics", help="súbor, ktorý --serve podáva")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--record", metavar="PATH", help="ulož všetky odpovede a snímky prehliadača do zip nahrávky")
+    mode.add_argument("--replay", metavar="PATH", help="prehraj beh z nahrávky bez siete a prehliadača")
+    parser.add_argument("--out", metavar="DIR", help="adresár pre výstup a stav pri --record/--replay (predvolene dočasný)")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
+    args = parse_args()
+    if args.serve is not None:
+        serve_feed(args.feed, args.host, args.serve)
+        raise SystemExit(0)
+
     print(f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Spúšťam scraper...\n")
 
-    events = []
-    events += scrape_itvalley_events()
-    events += scrape_amcham_events()
-    events += scrape_sopk_events()
-    events += scrape_ickk_events()
-
-    if events:
-        print(f"[+] Načítaných spolu {len(events)} podujatí zo všetkých zdrojov")
-        export_events_to_ics(events, filename="events.ics")
+    ics_path = "events.ics"
+    if args.record or args.replay:
+        # Nahrávka musí obsahovať (a prehrávanie vrátiť) celý beh: bez HTTP cache a plánovača,
+        # s prázdnym stavom stránkovania a s úložiskom aj výstupom mimo produkčných súborov.
+        TRANSPORT = RecordingTransport(args.record) if args.record else ReplayTransport(args.replay)
+        atexit.register(TRANSPORT.close)
+        HTTP_CACHE = None
+        out_dir = args.out or tempfile.mkdtemp(prefix="cike-replay-" if args.replay else "cike-record-")
+        scratch = os.path.join(out_dir, "state")
+        PAGINATION_STATE_PATH = os.path.join(scratch, "pagination.json")
+        ENRICH_CACHE_PATH = os.path.join(scratch, "enrich.json")
+        EVENT_STORE_PATH = os.path.join(scratch, "events.sqlite")
+        EXPORT_INDEX_DIR = os.path.join(scratch, "export")
+        if os.path.exists(PAGINATION_STATE_PATH) or os.path.exists(EVENT_STORE_PATH):
+            raise SystemExit(f"❌ Adresár '{out_dir}' obsahuje stav z iného behu – zvoľ prázdny --out")
+        ics_path = os.path.join(out_dir, "events.ics")
+        print(f"📁 Výstup a stav tohto behu: {out_dir}")
+    elif SCHEDULE_ENABLED:
+        SCHEDULER = RefreshScheduler(force=args.force)
+    counts, statuses = {}, {}
+    events = iter_scraped_events(counts=counts, statuses=statuses)
+    if ENRICH_ENABLED:
+        # Detaily sa sťahujú paralelne pre celý zoznam, preto sa tu prúd zhromaždí.
+        events = enrich_events(events)
+    store = EventStore(EVENT_STORE_PATH) if EVENT_STORE_ENABLED else None
+    if store is not None and not len(store) and os.path.exists(ics_path):
+        # Úložisko žije len v CI cache; po jej vyradení sa archív obnoví z commitnutého exportu.
+        print(f"🌱 Úložisko prázdne – naplnené {store.seed(iter_ics_events(ics_path))} udalosťami z '{ics_path}'")
+
+    if store is not None:
+        st = store.upsert(events)
+    else:
+        first = next(iter(events), None)
+        if first is not None:
+            export_events_to_ics(itertools.chain([first], events), filename=ics_path)
+    if SCHEDULER is not None:
+        SCHEDULER.save()
+
+    total = sum(counts.values())
+    if total:
+        print(f"[+] Načítaných spolu {total} podujatí zo všetkých zdrojov")
     else:
         print("⚠️ Nenašli sa žiadne podujatia – skontroluj štruktúru stránok.")
+
+    if store is not None:
+        # Prečistia sa len zdroje, ktoré dobehli bez chyby a časového limitu.
+        windows = {src: start for src, start in st["windows"].items() if statuses.get(src) == "ok"}
+        pruned = store.prune(windows)
+        print(f"🗄️ Úložisko: nové {st['new']}, zmenené {st['changed']}, nezmenené {st['unchanged']}"
+              f" (z uloženého stavu {st['carried']}), odstránené {pruned}, spolu {len(store)}")
+        if len(store):
+            export_events_to_ics(store, filename=ics_path)
+        store.close()
+
+    if HTTP_CACHE:
+        HTTP_CACHE.report()
+    if METRICS:
+        METRICS.write(ics_path)
@@ -0,0 +1,152 @@
+"""Equivalence check and microbenchmark for parse_numeric_or_sk_date.
+
+The randomized check compares the compiled, memoized parser against the
+original four-regex implementation (kept below as legacy_parse) on
+generated strings, including the exceptions both raise for invalid dates.
+
+    python benchmarks/bench_dates.py [--cases 20000] [--seed 1] [--rounds 50]
+"""
+import argparse
+import html
+import os
+import random
+import re
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Cike_calendar as cal  # noqa: E402
+
+# Texty v tvare, v akom prichádzajú z ITVALLEY widgetov a ICKK riadkov.
+CORPUS = [
+    "12. 3. 2026",
+    "12.3.2026",
+    "Košice 12. 3. 2026",
+    "3. 10. 2025 - 5. 10. 2025",
+    "28. 11. 2025 – 29. 11. 2025",
+    "12.–14. marca 2026",
+    "2. - 3. októbra 2025",
+    "5 mája 2025",
+    "17 septembra 2025 @ 9:00 - 12:00",
+    "Streda 5. novembra 2025 @ 9:00 - 12:00",
+    "UVP Technicom, Němcovej 5, Košice",
+    "Košice",
+    "Online",
+    "9:00 - 16:00",
+    "Registrácia &amp; káva od 8:30",
+    "Technical University of Košice",
+    "Deloitte Technology Fast 50 CE",
+]
+
+_TOKENS = [
+    "1", "5", "12", "31", "32", "0", "13", "2025", "2026", "1999",
+    ".", ". ", "–", "—", "-", " - ", " ", "  ", "\n", "&nbsp;", "&ndash;",
+    "marca", "Marca", "mája", "okt", "decembra", "foo", "@", "9:00", "Košice",
+]
+
+
+def legacy_parse(text: str):
+    if not text:
+        return None, None
+
+    t = html.unescape(text)
+    t = " ".join(t.lower().split())
+    t = t.replace("—", "–")
+
+    m = re.search(
+        r"\b(\d{1,2})\.\s*(\d{1,2})\.\s*(\d{4})\b\s*[–-]\s*\b(\d{1,2})\.\s*(\d{1,2})\.\s*(\d{4})\b",
+        t
+    )
+    if m:
+        s = datetime(int(m.group(3)), int(m.group(2)), int(m.group(1)))
+        e = datetime(int(m.group(6)), int(m.group(5)), int(m.group(4)))
+        return s, e
+
+    m = re.search(
+        r"\b(\d{1,2})\.\s*[–-]\s*(\d{1,2})\.\s*([a-zá-ž]+)\s+(\d{4})\b",
+        t
+    )
+    if m:
+        d1 = int(m.group(1))
+        d2 = int(m.group(2))
+        mon_word = m.group(3).strip(".")
+        y = int(m.group(4))
+        mo = cal._SK_MONTHS.get(mon_word)
+        if mo:
+            s = datetime(y, mo, d1)
+            e = datetime(y, mo, d2)
+            return s, e
+
+    m = re.search(r"\b(\d{1,2})\.\s*(\d{1,2})\.\s*(\d{4})\b", t)
+    if m:
+        d, mo, y = int(m.group(1)), int(m.group(2)), int(m.group(3))
+        dt = datetime(y, mo, d)
+        return dt, dt
+
+    m = re.search(r"\b(\d{1,2})\s+([a-zá-ž]+)\s+(\d{4})\b", t)
+    if m:
+        d = int(m.group(1))
+        mon_word = m.group(2).strip(".")
+        y = int(m.group(3))
+        mo = cal._SK_MONTHS.get(mon_word)
+        if mo:
+            dt = datetime(y, mo, d)
+            return dt, dt
+
+    return None, None
+
+
+def _outcome(fn, text):
+    try:
+        return fn(text)
+    except Exception as e:
+        return type(e)
+
+
+def check_equivalence(cases, seed):
+    rnd = random.Random(seed)
+    texts = list(CORPUS)
+    for _ in range(cases):
+        texts.append("".join(rnd.choice(_TOKENS) for _ in range(rnd.randint(0, 14))))
+
+    mismatches = 0
+    for text in texts:
+        expected, actual = _outcome(legacy_parse, text), _outcome(cal.parse_numeric_or_sk_date, text)
+        if expected != actual:
+            mismatches += 1
+            if mismatches <= 10:
+                print(f"❌ {text!r}: {expected} != {actual}")
+    print(f"ekvivalencia: {len(texts)} prípadov, {mismatches} rozdielov")
+    return mismatches == 0
+
+
+def bench(fn, rounds):
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        for text in CORPUS:
+            fn(text)
+    return (time.perf_counter() - t0) / (rounds * len(CORPUS))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--cases", type=int, default=20000)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--rounds", type=int, default=2000)
+    args = ap.parse_args()
+
+    ok = check_equivalence(args.cases, args.seed)
+
+    cal._parse_normalized_sk_date.cache_clear()
+    legacy = bench(legacy_parse, args.rounds)
+    current = bench(cal.parse_numeric_or_sk_date, args.rounds)
+    print(f"pôvodná: {legacy * 1e6:.2f} µs/volanie, nová: {current * 1e6:.2f} µs/volanie ({legacy / current:.1f}x)")
+    print(f"cache: {cal._parse_normalized_sk_date.cache_info()}")
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Benchmark and equivalence check for the ICKK list scanner.
+
+Runs the ICKK fixture pages (benchmarks/fixtures, kinds jsonld/ickk_text
+with an ickk.sk URL) through the original whole-page scanner, kept below as
+legacy_scan, and through the current path: a strained soup of the Tribe
+list container, the single-pass _scan_ickk_text, and no text scan at all
+when JSON-LD already yielded events. Text-only pages must produce the same
+events under both.
+
+    python benchmarks/bench_ickk.py [--rounds 50]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Cike_calendar as cal  # noqa: E402
+from run import Fixtures  # noqa: E402
+
+CUTOFF = datetime(1970, 1, 1)
+
+
+def legacy_scan(soup, url, cutoff, seen, stats=None):
+    events = []
+    text_lines = [cal.clean_text(line) for line in soup.get_text("\n").splitlines()]
+    text_lines = [x for x in text_lines if x]
+
+    i = 0
+    while i < len(text_lines):
+        line = text_lines[i]
+        has_time = "@" in line and re.search(r"\d{1,2}:\d{2}", line)
+
+        if not has_time:
+            i += 1
+            continue
+
+        event_datetime_line = line
+        title = text_lines[i + 1] if i + 1 < len(text_lines) else ""
+        if not title or len(title) < 3:
+            i += 1
+            continue
+
+        start_date, end_date = cal.parse_numeric_or_sk_date(event_datetime_line)
+
+        if not start_date:
+            for back in range(1, 4):
+                if i - back >= 0:
+                    st, en = cal.parse_numeric_or_sk_date(text_lines[i - back])
+                    if st:
+                        start_date, end_date = st, en
+                        break
+
+        if not start_date:
+            i += 1
+            continue
+
+        tr = cal.parse_time_range(event_datetime_line)
+        if tr:
+            sh, sm, eh, em = tr
+            start_dt = start_date.replace(hour=sh, minute=sm)
+            end_dt = start_date.replace(hour=eh, minute=em)
+            if end_dt < start_dt:
+                end_dt = start_dt
+        else:
+            start_dt = start_date
+            end_dt = end_date or start_date
+
+        location = ""
+        desc = ""
+
+        if i + 2 < len(text_lines):
+            possible_location = text_lines[i + 2]
+            if len(possible_location) < 180:
+                location = possible_location
+
+        if i + 3 < len(text_lines):
+            possible_desc = text_lines[i + 3]
+            if possible_desc != location:
+                desc = possible_desc
+
+        if stats is not None:
+            stats["total"] += 1
+            stats["digest"].update(f"{title}|{start_dt}|{end_dt}|{location}|{desc}".encode("utf-8"))
+
+        if "eventDisplay=past" in url and start_dt < cutoff:
+            if stats is not None:
+                stats["stale"] += 1
+            i += 1
+            continue
+
+        event_url = ""
+        m_url = re.search(r"https?://\S+", desc + " " + event_datetime_line)
+        if m_url:
+            event_url = cal.normalize_event_url(m_url.group(0))
+
+        key = event_url or cal.normalize_key(title, start_dt)
+        if key in seen:
+            if stats is not None:
+                stats["duplicate"] += 1
+            i += 1
+            continue
+
+        full_desc = (desc + ("\n\n" + event_url if event_url else "\n\n" + url)).strip()
+
+        seen.add(key)
+        events.append(cal.Event(
+            summary=title,
+            location=location,
+            description=full_desc,
+            start=start_dt,
+            end=end_dt,
+            source="ICKK",
+            url=event_url or cal.normalize_event_url(url),
+        ))
+        i += 1
+
+    return events
+
+
+def legacy_page(url, body):
+    # pôvodná cesta: celý soup, JSON-LD a vždy aj textový sken celej stránky
+    seen, stats = set(), cal.new_page_stats()
+    past = "eventDisplay=past" in url
+    events = cal._extract_events_from_jsonld(body, source="ICKK", cutoff=CUTOFF if past else None, past=past,
+                                             seen=seen, stats=stats, encoding="utf-8")
+    events += legacy_scan(cal.make_soup(body.decode("utf-8")), url, CUTOFF, seen, stats)
+    return events
+
+
+def current_page(url, body):
+    pairs = cal._parse_page("ickk", url, body, "utf-8", source="ICKK", cutoff=CUTOFF)[0]
+    return [ev for _, ev in pairs]
+
+
+def bench(fn, pages, rounds):
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        for url, body in pages:
+            fn(url, body)
+    return (time.perf_counter() - t0) / (rounds * len(pages))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rounds", type=int, default=50)
+    args = ap.parse_args()
+
+    fx = Fixtures()
+    pages = [(u, fx.pages[u]) for u in fx.urls("jsonld", "ickk_text") if "ickk.sk" in u]
+
+    ok = True
+    for url, body in pages:
+        soup = cal.make_soup(body.decode("utf-8"))
+        old = legacy_scan(soup, url, CUTOFF, set())
+        new = cal._scan_ickk_text(cal.make_ickk_soup(body.decode("utf-8")), url, CUTOFF, set())
+        same = old == new
+        ok = ok and same
+        print(f"{url}: text {len(old)} / {len(new)} udalostí {'✅' if same else '❌'}, "
+              f"stránka {len(legacy_page(url, body))} -> {len(current_page(url, body))}")
+
+    legacy = bench(legacy_page, pages, args.rounds)
+    current = bench(current_page, pages, args.rounds)
+    print(f"pôvodný: {legacy * 1e3:.2f} ms/stránka, nový: {current * 1e3:.2f} ms/stránka ({legacy / current:.1f}x)")
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Equivalence check and microbenchmark for the JSON-LD fast path.
+
+Compares _clean_text (tag splitting) with the BeautifulSoup stripper
+_clean_text_dom on generated descriptions, and extraction from raw response
+bytes with the soup-based path on the JSON-LD fixture pages (events and the
+pagination digest must match), then times both page paths.
+
+    python benchmarks/bench_jsonld.py [--cases 20000] [--seed 1] [--rounds 200]
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Cike_calendar as cal  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Kúsky popisov v tvare, v akom prichádzajú z WordPress/Tribe JSON-LD.
+_TOKENS = [
+    "Konferencia", "Košice", " ", "  ", "\n", "\t", "&nbsp;", "&amp;", "&amp;amp;", "&lt;b&gt;",
+    "&#8211;", "&quot;", "<p>", "</p>", "<br>", "<br />", "<strong>", "</strong>", "<a href=\"x\">",
+    "</a>", "<em class='x'>", "a < b", "3 > 2", "<", ">", "<!-- pozn -->", "<script>x</script>",
+    "<style>p{}</style>", "<![CDATA[x]]>", "<!DOCTYPE html>", "9:00", "–", "„úvod“",
+]
+
+
+def check_clean_text(cases, seed):
+    rnd = random.Random(seed)
+    texts = ["", "  ", "Bez značiek", "<p>Úvod</p>\n<p>Program &amp; registrácia</p>"]
+    for _ in range(cases):
+        texts.append("".join(rnd.choice(_TOKENS) for _ in range(rnd.randint(0, 16))))
+
+    mismatches = 0
+    for text in texts:
+        expected, actual = cal._clean_text_dom(text), cal._clean_text(text)
+        if expected != actual:
+            mismatches += 1
+            if mismatches <= 10:
+                print(f"❌ {text!r}: {expected!r} != {actual!r}")
+    print(f"popisy: {len(texts)} prípadov, {mismatches} rozdielov")
+    return mismatches == 0
+
+
+def load_pages():
+    with open(os.path.join(FIXTURES, "manifest.json"), encoding="utf-8") as f:
+        manifest = json.load(f)
+    pages = []
+    for item in manifest:
+        if item["kind"] in ("jsonld", "ickk_text"):
+            with open(os.path.join(FIXTURES, item["file"]), "rb") as f:
+                pages.append((item["url"], f.read()))
+    return pages
+
+
+def _soup_path(body):
+    stats = cal.new_page_stats()
+    soup = cal.make_soup(body.decode("utf-8"), cal.JSONLD_STRAINER)
+    return cal._extract_events_from_jsonld(soup, seen=set(), stats=stats), stats
+
+
+def _bytes_path(body):
+    stats = cal.new_page_stats()
+    return cal._extract_events_from_jsonld(body, seen=set(), stats=stats, encoding="utf-8"), stats
+
+
+def _plain(stats):
+    return {k: v.hexdigest() if isinstance(v, type(hashlib.sha1())) else v for k, v in stats.items()}
+
+
+def check_pages(pages):
+    ok = True
+    for url, body in pages:
+        (ev_a, st_a), (ev_b, st_b) = _soup_path(body), _bytes_path(body)
+        if ev_a != ev_b or _plain(st_a) != _plain(st_b):
+            ok = False
+            print(f"❌ {url}: {len(ev_a)} vs {len(ev_b)} udalostí")
+    print(f"stránky: {len(pages)} fixtures, {'zhodné' if ok else 'ROZDIELNE'}")
+    return ok
+
+
+def bench(fn, pages, rounds):
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        for _, body in pages:
+            fn(body)
+    return (time.perf_counter() - t0) / (rounds * len(pages))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--cases", type=int, default=20000)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--rounds", type=int, default=200)
+    args = ap.parse_args()
+
+    pages = load_pages()
+    ok = check_clean_text(args.cases, args.seed)
+    ok = check_pages(pages) and ok
+
+    soup = bench(_soup_path, pages, args.rounds)
+    fast = bench(_bytes_path, pages, args.rounds)
+    print(f"soup: {soup * 1e3:.2f} ms/stránka, bajty: {fast * 1e3:.2f} ms/stránka ({soup / fast:.1f}x)")
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
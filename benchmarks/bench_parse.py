@@ -0,0 +1,85 @@
+"""Parse time and peak memory per listing page: full html.parser tree vs. make_soup().
+
+    python benchmarks/bench_parse.py                       # itv/jsonld pages from fixtures/manifest.json
+    python benchmarks/bench_parse.py itv=page.html jsonld=sopk.html
+
+Runs offline: pages come from the fixture manifest (run.Fixtures) or from
+local files, never from the network or .cache/http.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import Cike_calendar as cal  # noqa: E402
+from bs4 import BeautifulSoup  # noqa: E402
+from run import FIXTURES_DIR, Fixtures  # noqa: E402
+
+KINDS = {
+    "itv": (lambda soup: soup.find_all("div", class_="e-loop-item"), cal.ITV_STRAINER),
+    "jsonld": (lambda soup: soup.find_all("script", {"type": "application/ld+json"}), cal.JSONLD_STRAINER),
+}
+
+
+def load(fx, src):
+    if src in fx.pages:
+        return fx.text(src)
+    if os.path.exists(src):
+        with open(src, "r", encoding="utf-8") as f:
+            return f.read()
+    return ""
+
+
+def measure(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, result
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("pages", nargs="*", help="kind=súbor alebo kind=URL z manifestu, kind je itv alebo jsonld")
+    ap.add_argument("--fixtures", default=FIXTURES_DIR)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    fx = Fixtures(args.fixtures)
+    pages = [tuple(p.split("=", 1)) for p in args.pages] or [
+        (e["kind"], e["url"]) for e in fx.entries if e["kind"] in KINDS
+    ]
+    print(f"parser: {cal.HTML_PARSER}, fixtures: {fx.origins()}")
+    print(f"{'stránka':40} {'pred ms':>9} {'pred kB':>9} {'po ms':>9} {'po kB':>9} {'zrýchl.':>8}")
+
+    for kind, src in pages:
+        extract, strainer = KINDS[kind]
+        markup = load(fx, src)
+        if not markup:
+            print(f"{src[-40:]:40} (nenačítané)")
+            continue
+
+        t_before, m_before, r_before = measure(lambda: extract(BeautifulSoup(markup, "html.parser")), args.repeat)
+        t_after, m_after, r_after = measure(lambda: extract(cal.make_soup(markup, strainer)), args.repeat)
+
+        if len(r_before) != len(r_after):
+            print(f"⚠️ {src}: počet prvkov sa líši ({len(r_before)} vs {len(r_after)})")
+
+        print(
+            f"{src[-40:]:40} {t_before * 1000:9.1f} {m_before / 1024:9.0f}"
+            f" {t_after * 1000:9.1f} {m_after / 1024:9.0f} {t_before / t_after:7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Parse throughput of iter_parsed_pages for different CIKE_PARSE_WORKERS values.
+
+Serves the listing fixtures (repeated --copies times under distinct URLs)
+through a fixture-backed fetch and drains the two-stage pipeline, checking
+that every worker count yields the same events as in-process parsing.
+
+    python benchmarks/bench_pipeline.py [--copies 20] [--workers 0 1 2 4]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Cike_calendar as cal  # noqa: E402
+from run import Fixtures  # noqa: E402
+
+KINDS = {"itv": "itv", "jsonld": "jsonld", "ickk_text": "ickk"}
+
+
+def drain(fx, copies):
+    out = []
+    for fixture_kind, kind in KINDS.items():
+        urls = [f"{u}#{i}" for i in range(copies) for u in fx.urls(fixture_kind)]
+        fetch = lambda url: fx.http_get(url.split("#")[0])  # noqa: E731
+        for _, parsed in cal.iter_parsed_pages(urls, fetch, kind, cutoff=cal.datetime(1970, 1, 1)):
+            out.extend(ev for _, ev in parsed[0])
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--copies", type=int, default=20)
+    ap.add_argument("--workers", type=int, nargs="+", default=[0, 1, 2, 4])
+    args = ap.parse_args()
+
+    fx = Fixtures()
+    expected = None
+    ok = True
+    for workers in args.workers:
+        cal.PARSE_WORKERS = workers
+        cal._PARSE_POOL = None
+        pool = cal.get_parse_pool()
+        if pool is not None:
+            list(pool.map(abs, range(workers * 4)))  # zahriatie procesov
+        t0 = time.perf_counter()
+        events = drain(fx, args.copies)
+        elapsed = time.perf_counter() - t0
+        if pool is not None:
+            pool.shutdown()
+        expected = events if expected is None else expected
+        same = events == expected
+        ok = ok and same
+        pages = sum(len(fx.urls(k)) for k in KINDS) * args.copies
+        print(f"workers={workers}: {pages / elapsed:7.1f} stránok/s, {len(events)} udalostí"
+              f"{'' if same else '  ❌ iný výsledok'}")
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
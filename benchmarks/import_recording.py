@@ -0,0 +1,96 @@
+"""Import listing pages from a --record archive into the benchmark fixtures.
+
+The fixtures shipped in benchmarks/fixtures are synthetic (written offline
+to match the extractors). This copies the real listing responses of a
+recorded run into benchmarks/fixtures/recorded/ as UTF-8 and adds them to
+manifest.json with "origin": "recorded"; a recorded page replaces a
+synthetic entry with the same URL. AmCham is taken from the recorded
+browser snapshots (page_source) and replaces the synthetic AmCham page.
+
+    python Cike_calendar.py --record run.zip --out /tmp/record-out
+    # alebo artefakt record-<run_id> z workflow_dispatch s record=true
+    python benchmarks/import_recording.py run.zip [--per-kind 2]
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import zipfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(ROOT, "benchmarks", "fixtures")
+
+# (vzor URL, druh fixture); ICKK stránky bez JSON-LD podujatí sú "ickk_text"
+KIND_PATTERNS = [
+    (re.compile(r"^https://www\.kosiceitvalley\.sk/podujatia/"), "itv"),
+    (re.compile(r"^https://www\.sopk\.sk/events/zoznam/"), "jsonld"),
+    (re.compile(r"^https://ickk\.sk/events/zoznam/"), "jsonld"),
+]
+
+
+def fixture_kind(url, text):
+    for pattern, kind in KIND_PATTERNS:
+        if pattern.match(url):
+            if kind == "jsonld" and "ickk.sk" in url and '"@type":"Event"' not in text.replace(" ", ""):
+                return "ickk_text"
+            return kind
+    return None
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("archive")
+    ap.add_argument("--fixtures", default=FIXTURES_DIR)
+    ap.add_argument("--per-kind", type=int, default=2, help="najviac toľko stránok z každého druhu")
+    args = ap.parse_args()
+
+    with zipfile.ZipFile(args.archive) as archive:
+        index = json.loads(archive.read("index.json"))
+        picked = {}
+        for url, meta in index["responses"].items():
+            if meta.get("status") != 200:
+                continue
+            body = archive.read(meta["file"])
+            text = body.decode(meta.get("encoding") or "utf-8", errors="replace")
+            kind = fixture_kind(url, text)
+            if kind and len(picked.setdefault(kind, [])) < args.per_kind:
+                picked[kind].append((url, text))
+        # AmCham sa sťahuje prehliadačom: fixture je snímka page_source, nie HTTP odpoveď
+        for key, meta in index.get("snapshots", {}).items():
+            if key.startswith("amcham-") and len(picked.get("amcham", ())) < args.per_kind:
+                text = archive.read(meta["file"]).decode("utf-8", errors="replace")
+                picked.setdefault("amcham", []).append((f"https://amcham.sk/events#{key}", text))
+
+    manifest_path = os.path.join(args.fixtures, "manifest.json")
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    os.makedirs(os.path.join(args.fixtures, "recorded"), exist_ok=True)
+    imported = {}
+    for kind, pages in picked.items():
+        for url, text in pages:
+            name = f"recorded/{kind}_{hashlib.sha1(url.encode('utf-8')).hexdigest()[:10]}.html"
+            with open(os.path.join(args.fixtures, name), "w", encoding="utf-8", newline="") as f:
+                f.write(text)
+            imported[url] = {"kind": kind, "url": url, "file": name, "origin": "recorded"}
+
+    manifest = [
+        e for e in manifest
+        if e["url"] not in imported and not (e["kind"] == "amcham" and picked.get("amcham"))
+    ] + list(imported.values())
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+    for kind in ("itv", "amcham", "jsonld", "ickk_text"):
+        print(f"{kind:16} {len(picked.get(kind, []))} stránok")
+    missing = [k for k in ("itv", "amcham", "jsonld") if k not in picked]
+    if missing:
+        print(f"⚠️ v nahrávke chýbajú skutočné stránky: {', '.join(missing)}")
+    sys.exit(0 if imported else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""Offline benchmark suite: replays fixture pages through every extractor.
+
+Pages come from benchmarks/fixtures (manifest.json maps each URL to a file)
+and are served to iter_parsed_pages through a fixture-backed fetch, so no
+network is touched. Each stage is timed separately and the results are
+written as JSON. Shipped fixtures are synthetic ("origin": "synthetic");
+real listing pages are added from a --record archive with
+benchmarks/import_recording.py, and the report lists how many of each.
+
+    python benchmarks/run.py --output bench_results.json
+    python benchmarks/run.py --compare bench_results.json --threshold 0.10
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import Cike_calendar as cal  # noqa: E402
+
+FIXTURES_DIR = os.path.join(ROOT, "benchmarks", "fixtures")
+
+
+class Fixtures:
+    def __init__(self, root=FIXTURES_DIR):
+        with open(os.path.join(root, "manifest.json"), "r", encoding="utf-8") as f:
+            self.entries = json.load(f)
+        self.pages = {}
+        for entry in self.entries:
+            with open(os.path.join(root, entry["file"]), "rb") as f:
+                self.pages[entry["url"]] = f.read()
+
+    def origins(self):
+        counts = {}
+        for e in self.entries:
+            origin = e.get("origin", "synthetic")
+            counts[origin] = counts.get(origin, 0) + 1
+        return counts
+
+    def urls(self, *kinds):
+        return [e["url"] for e in self.entries if e["kind"] in kinds]
+
+    def text(self, url):
+        return self.pages[url].decode("utf-8")
+
+    def http_get(self, url, *args, **kwargs):
+        content = self.pages.get(url)
+        if content is None:
+            return None
+        return cal.CachedResponse(url, content, "utf-8", {"Content-Type": "text/html; charset=UTF-8"})
+
+
+def timed(fn, repeat):
+    fn()  # zahriatie
+    samples, result = [], None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - t0)
+    return samples, result
+
+
+def scaled_events(events, scale):
+    out = []
+    for k in range(scale):
+        for ev in events:
+            ev = dict(ev)
+            ev["start"] = ev["start"] + timedelta(days=7 * k)
+            ev["end"] = ev["end"] + timedelta(days=7 * k)
+            if ev.get("url"):
+                ev["url"] = f"{ev['url']}-{k}"
+            out.append(ev)
+    return out
+
+
+def run_suite(fx, repeat, scale):
+    epoch = datetime(1970, 1, 1)
+    full_pages = fx.urls("amcham", "jsonld", "ickk_text")
+    soups = {url: cal.make_soup(fx.text(url)) for url in full_pages}
+    ickk_urls = [u for u in full_pages if "ickk.sk" in u]
+    ickk_soups = {u: cal.make_ickk_soup(fx.text(u)) for u in ickk_urls}
+
+    stages = {
+        "iter_parsed_pages": lambda: [
+            ev for fixture_kind, kind in (("itv", "itv"), ("jsonld", "jsonld"), ("ickk_text", "ickk"))
+            for _, parsed in cal.iter_parsed_pages(fx.urls(fixture_kind), fx.http_get, kind, cutoff=epoch)
+            if parsed for _, ev in parsed[0]
+        ],
+        "_parse_page:itv": lambda: [
+            pair for u in fx.urls("itv") for pair in cal._parse_page("itv", u, fx.pages[u], "utf-8", source="ITVALLEY")[0]
+        ],
+        "make_soup": lambda: [cal.make_soup(fx.text(u)) for u in full_pages],
+        "extract_amcham_events_from_soup": lambda: [
+            ev for u in fx.urls("amcham")
+            for ev in cal.extract_amcham_events_from_soup([soups[u]], set())
+        ],
+        "_extract_events_from_jsonld": lambda: [
+            ev for u in fx.urls("jsonld")
+            for ev in cal._extract_events_from_jsonld(fx.pages[u], source="OTHER", seen=set(), encoding="utf-8")
+        ],
+        "_scan_ickk_text": lambda: [
+            ev for u in ickk_urls for ev in cal._scan_ickk_text(ickk_soups[u], u, epoch, set())
+        ],
+    }
+
+    results = {}
+    corpus = []
+    for name, fn in stages.items():
+        samples, out = timed(fn, repeat)
+        results[name] = _summary(samples, len(out))
+        if name.startswith(("extract", "_extract", "_scan")):
+            corpus.extend(out)
+
+    raw = scaled_events(corpus, scale)
+    samples, events = timed(lambda: [cal.Event.from_dict(ev) for ev in raw], repeat)
+    results["Event"] = _summary(samples, len(events))
+    samples, _ = timed(lambda: [cal._dedupe_key(ev) for ev in events], repeat)
+    results["_dedupe_key"] = _summary(samples, len(events))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cal.EXPORT_INDEX_DIR = os.path.join(tmp, "index")
+        target = os.path.join(tmp, "events.ics")
+
+        def full_export():
+            if os.path.exists(target):
+                os.remove(target)
+            cal.export_events_to_ics(events, filename=target)
+
+        with open(os.devnull, "w") as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                samples, _ = timed(full_export, repeat)
+                results["export_events_to_ics"] = _summary(samples, len(events))
+                samples, _ = timed(lambda: cal.export_events_to_ics(events, filename=target), repeat)
+                results["export_events_to_ics:incremental"] = _summary(samples, len(events))
+            finally:
+                sys.stdout = stdout
+
+    return results
+
+
+def _summary(samples, items):
+    return {
+        "best_ms": round(min(samples) * 1000, 3),
+        "median_ms": round(statistics.median(samples) * 1000, 3),
+        "items": items,
+    }
+
+
+def compare(current, baseline, threshold):
+    regressions = []
+    print(f"{'stage':36} {'base ms':>10} {'now ms':>10} {'zmena':>8}")
+    for name, stats in current["stages"].items():
+        base = baseline.get("stages", {}).get(name)
+        if not base:
+            print(f"{name:36} {'-':>10} {stats['median_ms']:10.2f} {'nové':>8}")
+            continue
+        ratio = stats["median_ms"] / base["median_ms"] if base["median_ms"] else 1.0
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            flag = "  ❌ regresia"
+        print(f"{name:36} {base['median_ms']:10.2f} {stats['median_ms']:10.2f} {ratio - 1:+7.0%}{flag}")
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--fixtures", default=FIXTURES_DIR)
+    ap.add_argument("--repeat", type=int, default=7)
+    ap.add_argument("--scale", type=int, default=25, help="násobok udalostí pre dedupe/export")
+    ap.add_argument("--output", help="kam zapísať výsledky (JSON)")
+    ap.add_argument("--compare", help="JSON z predchádzajúceho behu na porovnanie")
+    ap.add_argument("--threshold", type=float, default=0.10, help="povolené spomalenie (0.10 = 10 %%)")
+    args = ap.parse_args()
+
+    fx = Fixtures(args.fixtures)
+    report = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "parser": cal.HTML_PARSER,
+            "repeat": args.repeat,
+            "scale": args.scale,
+            "fixtures": fx.origins(),
+        },
+        "stages": run_suite(fx, args.repeat, args.scale),
+    }
+    if not report["meta"]["fixtures"].get("recorded"):
+        print("⚠️ len syntetické fixtures – čísla nemerajú skutočné značkovanie (pozri import_recording.py)")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"❌ regresie nad {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+        print("✅ bez regresií")
+    else:
+        for name, stats in report["stages"].items():
+            print(f"{name:36} {stats['median_ms']:10.2f} ms  ({stats['items']} položiek)")
+
+
+if __name__ == "__main__":
+    main()